@@ -16,25 +16,65 @@ On VPS:
 """
 
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from flask import Flask, jsonify, render_template, request
 from db import (
     init_db, get_recent_trades, get_pnl_summary, get_overall_stats, get_last_heartbeat,
-    init_parameters, get_all_parameters, get_parameter, update_parameter
+    init_parameters, get_all_parameters_rich, get_parameter, update_parameter
 )
 from shadow import get_shadow_trades, get_shadow_stats
 from risk import get_trading_enabled, get_api_error_count, get_trades_this_hour, get_last_alert_message
-from optimizer import compare_shadow_vs_real
+from optimizer import compare_shadow_vs_real, bootstrap as optimizer_bootstrap
 from param_store import get_store
 from logger import get_logger
 import config
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = get_logger(__name__)
 
 app = Flask(__name__)
 app.config['JSON_SORT_KEYS'] = False
 
-init_db()
-init_parameters()
+_QUERY_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="api-query")
+
+_init_done = False
+_init_lock = threading.Lock()
+
+
+def _json_response(payload):
+    """
+    Serialize a response body with orjson when it is installed, falling
+    back to Flask's jsonify otherwise. orjson encodes the larger payloads
+    (diagnostics, trade lists) several times faster than stdlib json.
+    """
+    if orjson is not None:
+        return app.response_class(orjson.dumps(payload), mimetype="application/json")
+    return jsonify(payload)
+
+@app.before_request
+def _ensure_init() -> None:
+    """
+    Initialize the databases once per process, on the first request.
+    Import-time init ran the DDL in every process that imported this
+    module (each gunicorn worker, tests, scripts); the guard makes it a
+    cheap flag check after the first call.
+    """
+    global _init_done
+    if _init_done:
+        return
+    with _init_lock:
+        if not _init_done:
+            init_db()
+            init_parameters()
+            # /api/compare needs the generated timestamp_unix column and
+            # its indexes even when the bot process hasn't run yet.
+            optimizer_bootstrap()
+            _init_done = True
 
 
 @app.route("/")
@@ -47,27 +87,27 @@ def index():
 def api_recent_trades():
     """Get the most recent trades."""
     trades = get_recent_trades(limit=100)
-    return jsonify(trades)
+    return _json_response(trades)
 
 
 @app.route("/api/stats/summary")
 def api_stats_summary():
     """Get overall trading statistics."""
     stats = get_overall_stats()
-    return jsonify(stats)
+    return _json_response(stats)
 
 
 @app.route("/api/stats/daily_pnl")
 def api_daily_pnl():
     """Get daily PNL for the last 14 days."""
     summary = get_pnl_summary(days=14)
-    return jsonify(summary)
+    return _json_response(summary)
 
 
 @app.route("/api/health")
 def api_health():
     """Health check endpoint."""
-    return jsonify({"status": "ok"})
+    return _json_response({"status": "ok"})
 
 
 @app.route("/api/fees")
@@ -81,7 +121,7 @@ def api_fees():
                 "maker": fee_data["maker"] * 100,
                 "taker": fee_data["taker"] * 100
             })
-    return jsonify(fees)
+    return _json_response(fees)
 
 
 @app.route("/api/diagnostics")
@@ -90,11 +130,17 @@ def api_diagnostics():
     Comprehensive diagnostics endpoint.
     Returns system status, trading metrics, and alerts.
     """
-    real_stats = get_overall_stats()
-    shadow_stats = get_shadow_stats(days=7)
-    
+    real_future = _QUERY_POOL.submit(get_overall_stats)
+    shadow_future = _QUERY_POOL.submit(get_shadow_stats, days=7)
+    heartbeat_future = _QUERY_POOL.submit(get_last_heartbeat)
+
+    real_stats = real_future.result()
+    shadow_stats = shadow_future.result()
+    last_heartbeat = heartbeat_future.result()
+
+
     diagnostics = {
-        "last_heartbeat": get_last_heartbeat(),
+        "last_heartbeat": last_heartbeat,
         "trading_enabled": get_trading_enabled(),
         "daily_pnl_usd": real_stats.get("total_pnl_usd", 0),
         "api_error_count": get_api_error_count(),
@@ -125,32 +171,32 @@ def api_diagnostics():
             "volatility_threshold": config.VOLATILITY_THRESHOLD_PERCENT,
             "safety_margin_spread": config.SAFETY_MARGIN_SPREAD
         },
-        "live_params": get_store().get_all(),
+        "live_params": dict(get_store().get_all()),
         "params_last_reload": get_store().get_last_reload_time()
     }
     
-    return jsonify(diagnostics)
+    return _json_response(diagnostics)
 
 
 @app.route("/api/shadow/trades")
 def api_shadow_trades():
     """Get recent shadow trades."""
     trades = get_shadow_trades(limit=100)
-    return jsonify(trades)
+    return _json_response(trades)
 
 
 @app.route("/api/shadow/stats")
 def api_shadow_stats():
     """Get shadow trading statistics."""
     stats = get_shadow_stats(days=14)
-    return jsonify(stats)
+    return _json_response(stats)
 
 
 @app.route("/api/compare")
 def api_compare():
     """Compare real vs shadow trading performance."""
     comparison = compare_shadow_vs_real(days=7)
-    return jsonify(comparison)
+    return _json_response(comparison)
 
 
 # =============================================================================
@@ -168,8 +214,8 @@ def api_get_params():
     Get all configurable parameters.
     Returns list of parameters with name, value, min/max range, and description.
     """
-    params = get_all_parameters()
-    return jsonify(params)
+    params = get_all_parameters_rich()
+    return _json_response(params)
 
 
 @app.route("/api/params/update", methods=["POST"])
@@ -182,22 +228,22 @@ def api_update_param():
     try:
         data = request.get_json()
         if not data:
-            return jsonify({"success": False, "message": "Invalid JSON"}), 400
+            return _json_response({"success": False, "message": "Invalid JSON"}), 400
         
         name = data.get("name")
         value = data.get("value")
         
         if not name or value is None:
-            return jsonify({"success": False, "message": "Missing name or value"}), 400
+            return _json_response({"success": False, "message": "Missing name or value"}), 400
         
         try:
             new_value = float(value)
         except (TypeError, ValueError):
-            return jsonify({"success": False, "message": "Value must be a number"}), 400
+            return _json_response({"success": False, "message": "Value must be a number"}), 400
         
         param = get_parameter(name)
         if not param:
-            return jsonify({"success": False, "message": "Unknown parameter"}), 404
+            return _json_response({"success": False, "message": "Unknown parameter"}), 404
         
         success, message = update_parameter(name, new_value)
         
@@ -206,11 +252,11 @@ def api_update_param():
             store = get_store()
             store.reload_params()
         
-        return jsonify({"success": success, "message": message})
+        return _json_response({"success": success, "message": message})
     
     except Exception as e:
         logger.error(f"Error updating parameter: {e}")
-        return jsonify({"success": False, "message": str(e)}), 500
+        return _json_response({"success": False, "message": str(e)}), 500
 
 
 if __name__ == "__main__":
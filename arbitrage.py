@@ -4,7 +4,12 @@ Finds and executes cross-exchange arbitrage opportunities.
 """
 
 import json
-from datetime import datetime, timedelta
+import time
+from collections import deque
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
 from typing import Any, Optional
 
 import config
@@ -14,35 +19,134 @@ from logger import get_logger
 from utils import format_opportunity, extract_base_quote
 from db import insert_trade
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import orjson
+
+    def _dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _dumps(obj: Any) -> str:
+        return json.dumps(obj)
+
 logger = get_logger(__name__)
 
-open_trades: list[dict] = []
-trade_history: list[dict] = []
+open_trades: dict[str, dict] = {}
 MAX_TRADE_HISTORY: int = 100
+trade_history: deque[dict] = deque(maxlen=MAX_TRADE_HISTORY)
+
+# Number of trades in open_trades still in "pending" status, maintained at
+# the three status transitions so get_open_trades_count never scans.
+_pending_count: int = 0
+
+# True whenever open_trades changed since the last prune, so the
+# every-iteration prune call is a no-op on idle loops.
+_trades_dirty: bool = False
+
+# Single worker so trade writes stay serialized (SQLite-friendly) while the
+# scan loop never waits on a commit.
+_DB_EXEC = ThreadPoolExecutor(max_workers=1, thread_name_prefix="db-writer")
+
 TRADE_COOLDOWN_SECONDS: int = 60
 
 
+def _log_db_error(future) -> None:
+    """Surface exceptions from deferred database writes."""
+    exc = future.exception()
+    if exc is not None:
+        logger.error(f"Failed to save trade to database: {exc}")
+
+
+def _persist_trade(trade_record: dict) -> None:
+    """
+    Serialize the order payloads and write the trade.
+    Runs on the DB worker so the (potentially deep) ccxt response dicts
+    are never walked on the trade-execution thread.
+    """
+    trade_record["extra_info"] = _dumps(trade_record["extra_info"])
+    insert_trade(trade_record)
+
+
+@lru_cache(maxsize=None)
 def get_exchange_fee(exchange_id: str, fee_type: str = "taker") -> float:
-    """Get the fee for an exchange from config."""
+    """Get the fee for an exchange from config (cached; the domain is tiny)."""
     fees = config.EXCHANGE_FEES.get(exchange_id, {"maker": 0.001, "taker": 0.001})
     return fees.get(fee_type, 0.001)
 
 
-def calculate_effective_min_spread(
-    buy_exchange: str,
-    sell_exchange: str,
-    avg_slippage: float = 0.0
-) -> float:
+# Below this many exchanges the Python loop beats NumPy's array-setup cost.
+_VECTORIZE_MIN_EXCHANGES = 8
+
+
+def _scan_spreads_numpy(
+    bids: list[float],
+    asks: list[float],
+    fees: list[float],
+    max_slippage_percent: float,
+    safety_margin: float
+) -> list[tuple[int, int, float, float, float]]:
+    """Vectorized variant of _scan_spreads over the full buy/sell matrix."""
+    ask_arr = np.asarray(asks, dtype=np.float64)
+    bid_arr = np.asarray(bids, dtype=np.float64)
+    fee_arr = np.asarray(fees, dtype=np.float64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        raw = (bid_arr[None, :] - ask_arr[:, None]) / ask_arr[:, None] * 100
+    total_fees = fee_arr[:, None] + fee_arr[None, :]
+    net = raw - total_fees
+    effective_min = total_fees + max_slippage_percent + safety_margin
+
+    mask = (net >= effective_min) & (ask_arr[:, None] > 0)
+    np.fill_diagonal(mask, False)
+
+    buy_idx, sell_idx = np.nonzero(mask)
+    return [
+        (int(i), int(j), float(raw[i, j]), float(net[i, j]), float(effective_min[i, j]))
+        for i, j in zip(buy_idx, sell_idx)
+    ]
+
+
+def _scan_spreads(
+    bids: list[float],
+    asks: list[float],
+    fees: list[float],
+    max_slippage_percent: float,
+    safety_margin: float
+) -> list[tuple[int, int, float, float, float]]:
     """
-    Calculate dynamic minimum spread based on fees and slippage.
-    Returns the effective minimum spread required for a profitable trade.
+    Scan all buy/sell exchange pairs for profitable spreads.
+    Pure numeric kernel over parallel bid/ask/fee lists; returns
+    (buy_index, sell_index, raw_spread, net_spread, effective_min) tuples.
     """
-    buy_fee = get_exchange_fee(buy_exchange, "taker") * 100
-    sell_fee = get_exchange_fee(sell_exchange, "taker") * 100
-    safety_margin = config.SAFETY_MARGIN_SPREAD
+    n = len(asks)
+    if np is not None and n >= _VECTORIZE_MIN_EXCHANGES:
+        return _scan_spreads_numpy(bids, asks, fees, max_slippage_percent, safety_margin)
+
+    hits: list[tuple[int, int, float, float, float]] = []
+
+    for i in range(n):
+        buy_price = asks[i]
+        if buy_price <= 0:
+            continue
+        buy_fee = fees[i]
+
+        for j in range(n):
+            if i == j:
+                continue
+
+            raw_spread = ((bids[j] - buy_price) / buy_price) * 100
+            total_fees = buy_fee + fees[j]
+            net_spread = raw_spread - total_fees
+            effective_min = total_fees + max_slippage_percent + safety_margin
 
-    effective_min = buy_fee + sell_fee + avg_slippage + safety_margin
-    return effective_min
+            if net_spread >= effective_min:
+                hits.append((i, j, raw_spread, net_spread, effective_min))
+
+    return hits
 
 
 def find_arbitrage_opportunities(
@@ -58,66 +162,59 @@ def find_arbitrage_opportunities(
     Returns a list of opportunities that meet the minimum spread requirement.
     """
     opportunities: list[dict] = []
+    scan_time_iso = datetime.utcnow().isoformat()
+
+    # One batched fetch per exchange covers all pairs for this scan.
+    all_tickers = exchange_manager.get_all_tickers(trading_pairs)
 
     for symbol in trading_pairs:
         if not risk_manager.should_trade_now(symbol):
             logger.debug(f"Skipping {symbol} - should_trade_now returned False")
             continue
 
-        tickers: list[tuple[str, float, float]] = []
+        tickers: list[tuple[str, float, float, float]] = []
 
-        for exchange_id in exchange_manager.exchange_ids:
-            ticker = exchange_manager.get_ticker(exchange_id, symbol)
+        for exchange_id, exchange_tickers in all_tickers.items():
+            ticker = exchange_tickers.get(symbol)
             if ticker and ticker.get("bid") and ticker.get("ask"):
-                tickers.append((exchange_id, ticker["bid"], ticker["ask"]))
+                fee_percent = get_exchange_fee(exchange_id, "taker") * 100
+                tickers.append((exchange_id, ticker["bid"], ticker["ask"], fee_percent))
                 from risk import update_price_history
                 update_price_history(symbol, (ticker["bid"] + ticker["ask"]) / 2)
 
         if len(tickers) < 2:
             continue
 
-        for i, (buy_exchange, buy_bid, buy_ask) in enumerate(tickers):
-            for j, (sell_exchange, sell_bid, sell_ask) in enumerate(tickers):
-                if i == j:
-                    continue
-
-                buy_price = buy_ask
-                sell_price = sell_bid
-
-                if buy_price <= 0:
-                    continue
-
-                raw_spread_percent = ((sell_price - buy_price) / buy_price) * 100
-
-                buy_fee = get_exchange_fee(buy_exchange, "taker") * 100
-                sell_fee = get_exchange_fee(sell_exchange, "taker") * 100
-                total_fees_percent = buy_fee + sell_fee
-
-                net_spread_percent = raw_spread_percent - total_fees_percent
-
-                effective_min_spread = calculate_effective_min_spread(
-                    buy_exchange, sell_exchange, max_slippage_percent
-                )
-
-                if net_spread_percent >= effective_min_spread:
-                    opportunity = {
-                        "symbol": symbol,
-                        "buy_exchange_id": buy_exchange,
-                        "sell_exchange_id": sell_exchange,
-                        "buy_price": buy_price,
-                        "sell_price": sell_price,
-                        "raw_spread_percent": raw_spread_percent,
-                        "net_spread_percent": net_spread_percent,
-                        "buy_fee_percent": buy_fee,
-                        "sell_fee_percent": sell_fee,
-                        "effective_min_spread": effective_min_spread,
-                        "timestamp": datetime.utcnow().isoformat()
-                    }
-                    opportunities.append(opportunity)
-                    logger.info(f"Opportunity found: {format_opportunity(opportunity)}")
-                    from risk import record_opportunity_found
-                    record_opportunity_found()
+        bids = [t[1] for t in tickers]
+        asks = [t[2] for t in tickers]
+        fees = [t[3] for t in tickers]
 
+        hits = _scan_spreads(
+            bids, asks, fees, max_slippage_percent, config.SAFETY_MARGIN_SPREAD
+        )
+
+        for i, j, raw_spread_percent, net_spread_percent, effective_min_spread in hits:
+            opportunity = {
+                "symbol": symbol,
+                "buy_exchange_id": tickers[i][0],
+                "sell_exchange_id": tickers[j][0],
+                "buy_price": asks[i],
+                "sell_price": bids[j],
+                "raw_spread_percent": raw_spread_percent,
+                "net_spread_percent": net_spread_percent,
+                "buy_fee_percent": fees[i],
+                "sell_fee_percent": fees[j],
+                "effective_min_spread": effective_min_spread,
+                "timestamp": scan_time_iso
+            }
+            opportunities.append(opportunity)
+            logger.info(f"Opportunity found: {format_opportunity(opportunity)}")
+            from risk import record_opportunity_found
+            record_opportunity_found()
+
+    # Best spreads first, so when the caller hits its open-trade or hourly
+    # cap the trades it did take were the most profitable candidates.
+    opportunities.sort(key=itemgetter("net_spread_percent"), reverse=True)
     return opportunities
 
 
@@ -183,7 +280,7 @@ def execute_arbitrage_opportunity(
         f"SELL on {sell_exchange} @ {sell_price:.2f}"
     )
 
-    trade_id = f"{symbol}_{buy_exchange}_{sell_exchange}_{datetime.utcnow().timestamp()}"
+    trade_id = f"{symbol}_{buy_exchange}_{sell_exchange}_{time.time_ns()}"
     pending_trade = {
         "id": trade_id,
         "symbol": symbol,
@@ -195,7 +292,10 @@ def execute_arbitrage_opportunity(
         "timestamp": datetime.utcnow().isoformat(),
         "status": "pending"
     }
-    open_trades.append(pending_trade)
+    open_trades[trade_id] = pending_trade
+    global _pending_count, _trades_dirty
+    _pending_count += 1
+    _trades_dirty = True
 
     try:
         buy_order = exchange_manager.create_order(
@@ -256,49 +356,40 @@ def execute_arbitrage_opportunity(
 
 def _mark_trade_failed_and_prune(trade_id: str, failure_reason: str, failed_order: dict, successful_order: Optional[dict] = None) -> None:
     """Mark a trade as failed and immediately archive it to history."""
-    global open_trades
-    
-    trade_to_archive = None
-    for trade in open_trades:
-        if trade.get("id") == trade_id:
-            trade["status"] = "failed"
-            trade["failure_reason"] = failure_reason
-            trade["failed_order"] = failed_order
-            if successful_order:
-                trade["partial_order"] = successful_order
-            trade["completed_at"] = datetime.utcnow().isoformat()
-            trade_to_archive = trade
-            logger.warning(f"Trade {trade_id} marked as failed: {failure_reason}")
-            break
-    
-    if trade_to_archive:
-        open_trades = [t for t in open_trades if t.get("id") != trade_id]
-        trade_history.append(trade_to_archive)
-        if len(trade_history) > MAX_TRADE_HISTORY:
-            trade_history.pop(0)
+    global _pending_count
+    trade = open_trades.pop(trade_id, None)
+    if trade is None:
+        return
+
+    if trade.get("status") == "pending":
+        _pending_count -= 1
+    trade["status"] = "failed"
+    trade["failure_reason"] = failure_reason
+    trade["failed_order"] = failed_order
+    if successful_order:
+        trade["partial_order"] = successful_order
+    trade["completed_at"] = datetime.utcnow().isoformat()
+    logger.warning(f"Trade {trade_id} marked as failed: {failure_reason}")
+
+    trade_history.append(trade)
 
 
 def _complete_trade_and_archive(trade_id: str, buy_order: dict, sell_order: dict, net_profit: float) -> Optional[dict]:
     """Mark trade as completed, save to database, and archive to history."""
-    global open_trades
-    
-    executed_trade = None
-    for trade in open_trades:
-        if trade.get("id") == trade_id:
-            trade["status"] = "completed"
-            trade["buy_order"] = buy_order
-            trade["sell_order"] = sell_order
-            trade["estimated_profit_usd"] = net_profit
-            trade["completed_at"] = datetime.utcnow().isoformat()
-            executed_trade = trade
-            break
-    
+    global _pending_count
+    executed_trade = open_trades.pop(trade_id, None)
+
     if executed_trade:
-        open_trades = [t for t in open_trades if t.get("id") != trade_id]
+        if executed_trade.get("status") == "pending":
+            _pending_count -= 1
+        executed_trade["status"] = "completed"
+        executed_trade["buy_order"] = buy_order
+        executed_trade["sell_order"] = sell_order
+        executed_trade["estimated_profit_usd"] = net_profit
+        executed_trade["completed_at"] = datetime.utcnow().isoformat()
+
         trade_history.append(executed_trade)
-        if len(trade_history) > MAX_TRADE_HISTORY:
-            trade_history.pop(0)
-        
+
         try:
             buy_price = executed_trade.get("buy_price", 0)
             sell_price = executed_trade.get("sell_price", 0)
@@ -311,7 +402,7 @@ def _complete_trade_and_archive(trade_id: str, buy_order: dict, sell_order: dict
             net_spread = raw_spread - (config.DEFAULT_FEE_PERCENT * 2)
             
             trade_record = {
-                "timestamp": executed_trade.get("completed_at", datetime.utcnow().isoformat()),
+                "timestamp": executed_trade["completed_at"],
                 "symbol": executed_trade.get("symbol", ""),
                 "buy_exchange": executed_trade.get("buy_exchange", ""),
                 "sell_exchange": executed_trade.get("sell_exchange", ""),
@@ -323,14 +414,14 @@ def _complete_trade_and_archive(trade_id: str, buy_order: dict, sell_order: dict
                 "fees_estimated": fee_cost,
                 "pnl_usd": net_profit,
                 "dry_run": 1 if config.DRY_RUN else 0,
-                "extra_info": json.dumps({
+                "extra_info": {
                     "buy_order": buy_order,
                     "sell_order": sell_order,
                     "trade_id": trade_id
-                })
+                }
             }
-            insert_trade(trade_record)
-            logger.debug(f"Trade {trade_id} saved to database")
+            _DB_EXEC.submit(_persist_trade, trade_record).add_done_callback(_log_db_error)
+            logger.debug(f"Trade {trade_id} queued for database save")
         except Exception as e:
             logger.error(f"Failed to save trade to database: {e}")
     
@@ -339,51 +430,43 @@ def _complete_trade_and_archive(trade_id: str, buy_order: dict, sell_order: dict
 
 def prune_completed_trades() -> None:
     """Move completed/failed trades from open_trades to trade_history immediately."""
-    global open_trades
-    
-    trades_to_archive = []
-    remaining_trades = []
-    
-    for trade in open_trades:
-        status = trade.get("status")
-        if status in ("completed", "failed"):
-            trades_to_archive.append(trade)
-        else:
-            remaining_trades.append(trade)
-    
-    for trade in trades_to_archive:
-        trade_history.append(trade)
-        if len(trade_history) > MAX_TRADE_HISTORY:
-            trade_history.pop(0)
-    
-    open_trades = remaining_trades
-    
-    if trades_to_archive:
-        logger.debug(f"Archived {len(trades_to_archive)} trades to history")
+    global _trades_dirty
+    if not _trades_dirty:
+        return
+    _trades_dirty = False
+
+    archived = 0
+    for trade_id, trade in list(open_trades.items()):
+        if trade.get("status") in ("completed", "failed"):
+            trade_history.append(open_trades.pop(trade_id))
+            archived += 1
+
+    if archived:
+        logger.debug(f"Archived {archived} trades to history")
 
 
 def get_open_trades() -> list[dict]:
     """Return the list of currently pending trades (not yet completed)."""
-    return [t for t in open_trades if t.get("status") == "pending"]
+    return [t for t in open_trades.values() if t.get("status") == "pending"]
 
 
 def get_open_trades_count() -> int:
     """Return the count of currently active trades."""
-    return len(get_open_trades())
+    return _pending_count
 
 
 def clear_open_trades() -> None:
-    """Clear the open trades list."""
-    global open_trades
-    open_trades = []
+    """Clear the open trades mapping."""
+    global _pending_count
+    open_trades.clear()
+    _pending_count = 0
 
 
 def get_trade_history() -> list[dict]:
-    """Return the trade history list."""
-    return trade_history
+    """Return the trade history as a list."""
+    return list(trade_history)
 
 
 def clear_trade_history() -> None:
     """Clear the trade history."""
-    global trade_history
-    trade_history = []
+    trade_history.clear()
@@ -54,3 +54,9 @@ MIN_POSITION_SIZE_USD: float = 10.0
 MAX_POSITION_SIZE_USD: float = 1000.0
 
 SHADOW_TRADING_ENABLED: bool = True
+# Persist the full opportunity snapshot with each shadow trade. Useful
+# when debugging the simulation, but it is by far the largest column.
+SHADOW_STORE_EXTRA_INFO: bool = True
+
+MARKETS_CACHE_DIR: str = "markets_cache"
+MARKETS_CACHE_TTL_SECONDS: int = 24 * 60 * 60
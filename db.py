@@ -2,16 +2,145 @@
 Database module for storing arbitrage trades in SQLite.
 """
 
+import atexit
+import math
+import queue
 import sqlite3
+import threading
+import time
 from datetime import datetime, timedelta
 from typing import Optional
 
+from logger import get_logger
+
+logger = get_logger(__name__)
+
 DEFAULT_DB_PATH = "trades.db"
 
+_connections: dict[str, sqlite3.Connection] = {}
+_LOCK = threading.Lock()
+_TLS = threading.local()
+
+STATS_CACHE_TTL_SECONDS = 3.0
+_stats_cache: dict[tuple, tuple[float, object]] = {}
+
+
+def _stats_cache_get(key: tuple) -> Optional[object]:
+    """Return a cached stats result if present and not expired."""
+    entry = _stats_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, value = entry
+    if time.time() >= expires_at:
+        _stats_cache.pop(key, None)
+        return None
+    return value
+
+
+def _stats_cache_put(key: tuple, value: object) -> None:
+    """Store a stats result with the configured TTL."""
+    _stats_cache[key] = (time.time() + STATS_CACHE_TTL_SECONDS, value)
+
+
+def _invalidate_stats_cache() -> None:
+    """Drop all cached stats results (called after writes)."""
+    _stats_cache.clear()
+
+
+WRITE_BATCH_SIZE = 256
+WRITE_FLUSH_INTERVAL_SECONDS = 0.5
+
+# Hoisted so sqlite3's statement cache sees the identical string object on
+# every flush and skips re-preparing the statements.
+_INSERT_TRADE_SQL = '''
+    INSERT INTO trades (
+        timestamp, symbol, buy_exchange, sell_exchange,
+        buy_price, sell_price, amount,
+        gross_spread_percent, net_spread_percent,
+        fees_estimated, pnl_usd, dry_run, extra_info
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_UPSERT_DAILY_STATS_SQL = '''
+    INSERT INTO trade_stats_daily (
+        date, total_pnl, trade_count, winning_trades, losing_trades,
+        best_trade_pnl, worst_trade_pnl
+    ) VALUES (?, ?, 1, ?, ?, ?, ?)
+    ON CONFLICT(date) DO UPDATE SET
+        total_pnl = total_pnl + excluded.total_pnl,
+        trade_count = trade_count + 1,
+        winning_trades = winning_trades + excluded.winning_trades,
+        losing_trades = losing_trades + excluded.losing_trades,
+        best_trade_pnl = MAX(best_trade_pnl, excluded.best_trade_pnl),
+        worst_trade_pnl = MIN(worst_trade_pnl, excluded.worst_trade_pnl)
+'''
+_write_queue: queue.Queue = queue.Queue(maxsize=1000)
+_writer_thread: Optional[threading.Thread] = None
+
+
+def _get_conn(db_path: str = DEFAULT_DB_PATH) -> sqlite3.Connection:
+    """
+    Return a persistent connection for the given database path.
+    Opens it once with WAL mode so repeated calls skip the connect/fsync cost.
+    """
+    conn = _connections.get(db_path)
+    if conn is None:
+        with _LOCK:
+            conn = _connections.get(db_path)
+            if conn is None:
+                conn = sqlite3.connect(
+                    db_path, check_same_thread=False, cached_statements=256
+                )
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute("PRAGMA temp_store=MEMORY")
+                conn.execute("PRAGMA cache_size=-64000")
+                _connections[db_path] = conn
+    return conn
+
+
+def _close_connections() -> None:
+    """Close the shared write connections at interpreter exit."""
+    with _LOCK:
+        for conn in _connections.values():
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        _connections.clear()
+
+
+atexit.register(_close_connections)
+
+
+def _ro_conn(db_path: str = DEFAULT_DB_PATH) -> sqlite3.Connection:
+    """
+    Return this thread's read-only connection for the given database.
+    Readers stay off the shared write connection, so with WAL enabled
+    concurrent API requests query in parallel with the bot's writes.
+    """
+    conns = getattr(_TLS, "conns", None)
+    if conns is None:
+        conns = _TLS.conns = {}
+    conn = conns.get(db_path)
+    if conn is None:
+        try:
+            conn = sqlite3.connect(
+                f"file:{db_path}?mode=ro", uri=True, cached_statements=256
+            )
+            conn.execute("PRAGMA query_only=1")
+        except sqlite3.OperationalError:
+            # Database file doesn't exist yet; fall back to the shared
+            # connection, which creates it.
+            return _get_conn(db_path)
+        conn.row_factory = sqlite3.Row
+        conns[db_path] = conn
+    return conn
+
 
 def init_db(db_path: str = DEFAULT_DB_PATH) -> None:
     """Initialize the database and create tables if they don't exist."""
-    conn = sqlite3.connect(db_path)
+    conn = _get_conn(db_path)
     cursor = conn.cursor()
     
     cursor.execute('''
@@ -34,27 +163,60 @@ def init_db(db_path: str = DEFAULT_DB_PATH) -> None:
     ''')
     
     cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_trades_timestamp 
+        CREATE INDEX IF NOT EXISTS idx_trades_timestamp
         ON trades(timestamp DESC)
     ''')
-    
-    conn.commit()
-    conn.close()
 
+    cursor.execute("PRAGMA table_xinfo(trades)")
+    columns = {row[1] for row in cursor.fetchall()}
+    if "trade_date" not in columns:
+        cursor.execute('''
+            ALTER TABLE trades ADD COLUMN trade_date TEXT
+            GENERATED ALWAYS AS (substr(timestamp, 1, 10)) VIRTUAL
+        ''')
+
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_trades_symbol_date
+        ON trades(symbol, trade_date)
+    ''')
 
-def insert_trade(trade: dict, db_path: str = DEFAULT_DB_PATH) -> None:
-    """Insert a trade record into the database."""
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
     cursor.execute('''
-        INSERT INTO trades (
-            timestamp, symbol, buy_exchange, sell_exchange,
-            buy_price, sell_price, amount,
-            gross_spread_percent, net_spread_percent,
-            fees_estimated, pnl_usd, dry_run, extra_info
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
+        CREATE TABLE IF NOT EXISTS trade_stats_daily (
+            date TEXT PRIMARY KEY,
+            total_pnl REAL NOT NULL DEFAULT 0,
+            trade_count INTEGER NOT NULL DEFAULT 0,
+            winning_trades INTEGER NOT NULL DEFAULT 0,
+            losing_trades INTEGER NOT NULL DEFAULT 0,
+            best_trade_pnl REAL,
+            worst_trade_pnl REAL
+        )
+    ''')
+
+    cursor.execute('SELECT COUNT(*) FROM trade_stats_daily')
+    if cursor.fetchone()[0] == 0:
+        cursor.execute('''
+            INSERT INTO trade_stats_daily (
+                date, total_pnl, trade_count, winning_trades, losing_trades,
+                best_trade_pnl, worst_trade_pnl
+            )
+            SELECT
+                DATE(timestamp),
+                SUM(pnl_usd),
+                COUNT(*),
+                SUM(CASE WHEN pnl_usd > 0 THEN 1 ELSE 0 END),
+                SUM(CASE WHEN pnl_usd <= 0 THEN 1 ELSE 0 END),
+                MAX(pnl_usd),
+                MIN(pnl_usd)
+            FROM trades
+            GROUP BY DATE(timestamp)
+        ''')
+
+    conn.commit()
+
+
+def _trade_row(trade: dict) -> tuple:
+    """Build the parameter tuple for a trades INSERT from a trade dict."""
+    return (
         trade.get("timestamp", datetime.utcnow().isoformat()),
         trade.get("symbol", ""),
         trade.get("buy_exchange", ""),
@@ -68,18 +230,110 @@ def insert_trade(trade: dict, db_path: str = DEFAULT_DB_PATH) -> None:
         trade.get("pnl_usd", 0.0),
         trade.get("dry_run", 1),
         trade.get("extra_info")
-    ))
-    
-    conn.commit()
-    conn.close()
+    )
+
+
+def _daily_stats_row(trade: dict) -> tuple:
+    """Build the parameter tuple for the trade_stats_daily upsert."""
+    timestamp = trade.get("timestamp", datetime.utcnow().isoformat())
+    pnl = trade.get("pnl_usd", 0.0)
+    return (
+        timestamp[:10],
+        pnl,
+        1 if pnl > 0 else 0,
+        0 if pnl > 0 else 1,
+        pnl,
+        pnl
+    )
+
+
+def _flush_batch(batch: list[tuple[str, dict]]) -> None:
+    """Write a batch of queued trades in one transaction per database."""
+    by_path: dict[str, list[dict]] = {}
+    for db_path, trade in batch:
+        by_path.setdefault(db_path, []).append(trade)
+
+    for db_path, trades in by_path.items():
+        conn = _get_conn(db_path)
+        with _LOCK:
+            try:
+                conn.executemany(_INSERT_TRADE_SQL, [_trade_row(t) for t in trades])
+                conn.executemany(_UPSERT_DAILY_STATS_SQL, [_daily_stats_row(t) for t in trades])
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+    _invalidate_stats_cache()
+
+
+def _writer_loop() -> None:
+    """Drain the write queue, amortizing one commit over many trades."""
+    while True:
+        try:
+            first = _write_queue.get(timeout=WRITE_FLUSH_INTERVAL_SECONDS)
+        except queue.Empty:
+            continue
+        batch = [first]
+        while len(batch) < WRITE_BATCH_SIZE:
+            try:
+                batch.append(_write_queue.get_nowait())
+            except queue.Empty:
+                break
+        # A failed flush must not kill the writer thread: log, drop the
+        # batch and keep draining so later trades still get persisted.
+        try:
+            _flush_batch(batch)
+        except Exception as e:
+            logger.error(f"Error flushing trade batch ({len(batch)} rows): {e}")
+
+
+def _ensure_writer_started() -> None:
+    """Start the background writer thread on first use."""
+    global _writer_thread
+    if _writer_thread is None:
+        with _LOCK:
+            if _writer_thread is None:
+                _writer_thread = threading.Thread(
+                    target=_writer_loop, name="db-writer", daemon=True
+                )
+                _writer_thread.start()
+                atexit.register(flush_trades)
+
+
+def flush_trades() -> None:
+    """Synchronously write any trades still waiting in the queue."""
+    batch = []
+    while True:
+        try:
+            batch.append(_write_queue.get_nowait())
+        except queue.Empty:
+            break
+    if batch:
+        _flush_batch(batch)
+
+
+def insert_trade(trade: dict, db_path: str = DEFAULT_DB_PATH) -> None:
+    """
+    Queue a trade record for insertion.
+    Writes are batched by a background thread so callers never wait on fsync.
+    """
+    _ensure_writer_started()
+    try:
+        _write_queue.put_nowait((db_path, trade))
+    except queue.Full:
+        _flush_batch([(db_path, trade)])
 
 
 def get_recent_trades(limit: int = 100, db_path: str = DEFAULT_DB_PATH) -> list:
     """Get the most recent trades."""
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+    cache_key = ("recent_trades", limit, db_path)
+    cached = _stats_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    conn = _ro_conn(db_path)
     cursor = conn.cursor()
-    
+
     cursor.execute('''
         SELECT * FROM trades
         ORDER BY timestamp DESC
@@ -88,122 +342,123 @@ def get_recent_trades(limit: int = 100, db_path: str = DEFAULT_DB_PATH) -> list:
     
     rows = cursor.fetchall()
     trades = [dict(row) for row in rows]
-    
-    conn.close()
+
+    _stats_cache_put(cache_key, trades)
     return trades
 
 
 def get_pnl_summary(days: int = 7, db_path: str = DEFAULT_DB_PATH) -> list:
     """Get daily PNL summary for the last N days."""
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
+    cache_key = ("pnl_summary", days, db_path)
+    cached = _stats_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    conn = _ro_conn(db_path)
     cursor = conn.cursor()
-    
+
     start_date = (datetime.utcnow() - timedelta(days=days)).strftime("%Y-%m-%d")
-    
+
     cursor.execute('''
-        SELECT 
-            DATE(timestamp) as date,
-            SUM(pnl_usd) as total_pnl,
-            COUNT(*) as trade_count,
-            SUM(CASE WHEN pnl_usd > 0 THEN 1 ELSE 0 END) as winning_trades,
-            SUM(CASE WHEN pnl_usd <= 0 THEN 1 ELSE 0 END) as losing_trades
-        FROM trades
-        WHERE DATE(timestamp) >= ?
-        GROUP BY DATE(timestamp)
-        ORDER BY DATE(timestamp) ASC
+        SELECT date, total_pnl, trade_count, winning_trades, losing_trades
+        FROM trade_stats_daily
+        WHERE date >= ?
+        ORDER BY date ASC
     ''', (start_date,))
     
     rows = cursor.fetchall()
     summary = [dict(row) for row in rows]
-    
-    conn.close()
+
+    _stats_cache_put(cache_key, summary)
     return summary
 
 
 def get_overall_stats(db_path: str = DEFAULT_DB_PATH) -> dict:
     """Get overall trading statistics."""
-    conn = sqlite3.connect(db_path)
+    cache_key = ("overall_stats", db_path)
+    cached = _stats_cache_get(cache_key)
+    if cached is not None:
+        return cached
+
+    conn = _ro_conn(db_path)
     cursor = conn.cursor()
-    
+
     cursor.execute('''
-        SELECT 
-            COUNT(*) as total_trades,
-            COALESCE(SUM(pnl_usd), 0) as total_pnl_usd,
-            COALESCE(AVG(pnl_usd), 0) as avg_pnl_per_trade,
-            COALESCE(MAX(pnl_usd), 0) as best_trade_pnl,
-            COALESCE(MIN(pnl_usd), 0) as worst_trade_pnl,
-            SUM(CASE WHEN pnl_usd > 0 THEN 1 ELSE 0 END) as winning_trades
-        FROM trades
+        SELECT
+            COALESCE(SUM(trade_count), 0) as total_trades,
+            COALESCE(SUM(total_pnl), 0) as total_pnl_usd,
+            COALESCE(MAX(best_trade_pnl), 0) as best_trade_pnl,
+            COALESCE(MIN(worst_trade_pnl), 0) as worst_trade_pnl,
+            COALESCE(SUM(winning_trades), 0) as winning_trades
+        FROM trade_stats_daily
     ''')
     
     row = cursor.fetchone()
-    
+
     total_trades = row[0] or 0
-    winning_trades = row[5] or 0
+    total_pnl = row[1] or 0
+    winning_trades = row[4] or 0
     win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0.0
-    
+    avg_pnl = (total_pnl / total_trades) if total_trades > 0 else 0.0
+
     stats = {
         "total_trades": total_trades,
-        "total_pnl_usd": round(row[1] or 0, 2),
-        "avg_pnl_per_trade": round(row[2] or 0, 2),
-        "best_trade_pnl": round(row[3] or 0, 2),
-        "worst_trade_pnl": round(row[4] or 0, 2),
+        "total_pnl_usd": round(total_pnl, 2),
+        "avg_pnl_per_trade": round(avg_pnl, 2),
+        "best_trade_pnl": round(row[2] or 0, 2),
+        "worst_trade_pnl": round(row[3] or 0, 2),
         "win_rate": round(win_rate, 1)
     }
-    
-    conn.close()
+
+    _stats_cache_put(cache_key, stats)
     return stats
 
 
 def init_system_state_table(db_path: str = DEFAULT_DB_PATH) -> None:
     """Initialize system state table for heartbeat and status tracking."""
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS system_state (
-            key TEXT PRIMARY KEY,
-            value TEXT NOT NULL,
-            updated_at TEXT NOT NULL
-        )
-    ''')
-    
-    conn.commit()
-    conn.close()
+    conn = _get_conn(db_path)
+
+    # Writes on the shared connection must hold _LOCK so a commit here
+    # can't land in the middle of the writer thread's trade batch.
+    with _LOCK:
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS system_state (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )
+        ''')
+        conn.commit()
 
 
 def update_heartbeat(db_path: str = DEFAULT_DB_PATH) -> None:
     """Update the heartbeat timestamp."""
     init_system_state_table(db_path)
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
+    conn = _get_conn(db_path)
+
     now = datetime.utcnow().isoformat()
-    
-    cursor.execute('''
-        INSERT INTO system_state (key, value, updated_at)
-        VALUES ('last_heartbeat', ?, ?)
-        ON CONFLICT(key) DO UPDATE SET
-            value = excluded.value,
-            updated_at = excluded.updated_at
-    ''', (now, now))
-    
-    conn.commit()
-    conn.close()
+
+    with _LOCK:
+        conn.execute('''
+            INSERT INTO system_state (key, value, updated_at)
+            VALUES ('last_heartbeat', ?, ?)
+            ON CONFLICT(key) DO UPDATE SET
+                value = excluded.value,
+                updated_at = excluded.updated_at
+        ''', (now, now))
+        conn.commit()
 
 
 def get_last_heartbeat(db_path: str = DEFAULT_DB_PATH) -> Optional[str]:
     """Get the last heartbeat timestamp."""
     try:
         init_system_state_table(db_path)
-        conn = sqlite3.connect(db_path)
+        conn = _ro_conn(db_path)
         cursor = conn.cursor()
-        
+
         cursor.execute('SELECT value FROM system_state WHERE key = ?', ('last_heartbeat',))
         row = cursor.fetchone()
-        conn.close()
-        
+
         return row[0] if row else None
     except Exception:
         return None
@@ -211,20 +466,19 @@ def get_last_heartbeat(db_path: str = DEFAULT_DB_PATH) -> Optional[str]:
 
 def get_symbol_exposure(symbol: str, db_path: str = DEFAULT_DB_PATH) -> float:
     """Get total exposure for a symbol today."""
-    conn = sqlite3.connect(db_path)
+    conn = _ro_conn(db_path)
     cursor = conn.cursor()
-    
+
     today = datetime.utcnow().strftime("%Y-%m-%d")
     
     cursor.execute('''
         SELECT COALESCE(SUM(amount * buy_price), 0)
         FROM trades
-        WHERE symbol = ? AND DATE(timestamp) = ?
+        WHERE symbol = ? AND trade_date = ?
     ''', (symbol, today))
     
     row = cursor.fetchone()
-    conn.close()
-    
+
     return row[0] if row else 0.0
 
 
@@ -268,9 +522,56 @@ DEFAULT_PARAMETERS = {
 }
 
 
+# Single string objects so sqlite3's per-connection statement cache hits on
+# identity and never re-prepares these queries.
+_SQL_PARAM_GET_ALL = 'SELECT name, value FROM parameters'
+_SQL_PARAM_GET_ALL_RICH = (
+    'SELECT name, value, min_value, max_value, description, updated_at '
+    'FROM parameters ORDER BY name'
+)
+_SQL_PARAM_GET_ONE = (
+    'SELECT name, value, min_value, max_value, description, updated_at '
+    'FROM parameters WHERE name = ?'
+)
+_SQL_PARAM_GET_BOUNDS = 'SELECT name, min_value, max_value FROM parameters'
+_SQL_PARAM_GET_VALUE = 'SELECT value FROM parameters WHERE name = ?'
+_SQL_PARAM_UPDATE = 'UPDATE parameters SET value = ?, updated_at = ? WHERE name = ?'
+
+_now_iso_cache: tuple[float, str] = (0.0, "")
+
+
+def _utcnow_iso() -> str:
+    """
+    Current UTC time in ISO-8601, reused for up to a second.
+    Bulk parameter writes in quick succession share one formatted string
+    instead of building a datetime per row.
+    """
+    global _now_iso_cache
+    now = time.time()
+    cached_at, value = _now_iso_cache
+    if not value or now - cached_at >= 1.0:
+        value = datetime.utcnow().isoformat()
+        _now_iso_cache = (now, value)
+    return value
+
+
+# Validation bounds are immutable after init, so they are cached here and
+# update_parameter range-checks in Python instead of querying SQLite.
+_param_bounds: dict[str, tuple[float, float]] = {}
+
+
+def _load_param_bounds(db_path: str = DEFAULT_DB_PATH) -> None:
+    """Fill the bounds cache from the parameters table."""
+    conn = _get_conn(db_path)
+    cursor = conn.cursor()
+    cursor.execute(_SQL_PARAM_GET_BOUNDS)
+    for name, min_value, max_value in cursor.fetchall():
+        _param_bounds[name] = (min_value, max_value)
+
+
 def init_parameters(db_path: str = DEFAULT_DB_PATH) -> None:
     """Initialize the parameters table and populate with defaults if empty."""
-    conn = sqlite3.connect(db_path)
+    conn = _get_conn(db_path)
     cursor = conn.cursor()
     
     cursor.execute('''
@@ -289,30 +590,45 @@ def init_parameters(db_path: str = DEFAULT_DB_PATH) -> None:
     count = cursor.fetchone()[0]
     
     if count == 0:
-        now = datetime.utcnow().isoformat()
-        for name, config in DEFAULT_PARAMETERS.items():
-            cursor.execute('''
-                INSERT INTO parameters (name, value, min_value, max_value, description, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (name, config["value"], config["min"], config["max"], config["description"], now))
+        now = _utcnow_iso()
+        rows = [
+            (name, config["value"], config["min"], config["max"], config["description"], now)
+            for name, config in DEFAULT_PARAMETERS.items()
+        ]
+        cursor.executemany('''
+            INSERT INTO parameters (name, value, min_value, max_value, description, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', rows)
     
     conn.commit()
-    conn.close()
+    _load_param_bounds(db_path)
 
 
-def get_all_parameters(db_path: str = DEFAULT_DB_PATH) -> list:
-    """Get all parameters from the database."""
+def get_all_parameters(db_path: str = DEFAULT_DB_PATH) -> list[tuple[str, float]]:
+    """
+    Get all parameter (name, value) pairs.
+    Lean shape for reload paths: dict(get_all_parameters()) builds the
+    lookup map in one pass with no per-row dict. Dashboards that need
+    bounds and descriptions use get_all_parameters_rich.
+    """
     try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
+        conn = _ro_conn(db_path)
+        cursor = conn.cursor()
+
+        cursor.execute(_SQL_PARAM_GET_ALL)
+        return [(row[0], row[1]) for row in cursor.fetchall()]
+    except Exception:
+        return []
+
+
+def get_all_parameters_rich(db_path: str = DEFAULT_DB_PATH) -> list:
+    """Get all parameters with their bounds and descriptions."""
+    try:
+        conn = _ro_conn(db_path)
         cursor = conn.cursor()
-        
-        cursor.execute('SELECT name, value, min_value, max_value, description, updated_at FROM parameters ORDER BY name')
-        rows = cursor.fetchall()
-        params = [dict(row) for row in rows]
-        
-        conn.close()
-        return params
+
+        cursor.execute(_SQL_PARAM_GET_ALL_RICH)
+        return [dict(row) for row in cursor.fetchall()]
     except Exception:
         return []
 
@@ -320,14 +636,11 @@ def get_all_parameters(db_path: str = DEFAULT_DB_PATH) -> list:
 def get_parameter(name: str, db_path: str = DEFAULT_DB_PATH) -> Optional[dict]:
     """Get a single parameter by name."""
     try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
+        conn = _ro_conn(db_path)
         cursor = conn.cursor()
-        
-        cursor.execute('SELECT name, value, min_value, max_value, description, updated_at FROM parameters WHERE name = ?', (name,))
+
+        cursor.execute(_SQL_PARAM_GET_ONE, (name,))
         row = cursor.fetchone()
-        
-        conn.close()
         return dict(row) if row else None
     except Exception:
         return None
@@ -339,30 +652,29 @@ def update_parameter(name: str, new_value: float, db_path: str = DEFAULT_DB_PATH
     Returns (success, message) tuple.
     """
     try:
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT min_value, max_value FROM parameters WHERE name = ?', (name,))
-        row = cursor.fetchone()
-        
-        if not row:
-            conn.close()
-            return False, "Unknown parameter"
-        
-        min_val, max_val = row["min_value"], row["max_value"]
-        
+        bounds = _param_bounds.get(name)
+        if bounds is None:
+            if not _param_bounds:
+                _load_param_bounds(db_path)
+                bounds = _param_bounds.get(name)
+            if bounds is None:
+                return False, "Unknown parameter"
+
+        min_val, max_val = bounds
+
         if not (min_val <= new_value <= max_val):
-            conn.close()
             return False, f"Value out of allowed range ({min_val} - {max_val})"
-        
-        now = datetime.utcnow().isoformat()
-        cursor.execute('''
-            UPDATE parameters SET value = ?, updated_at = ? WHERE name = ?
-        ''', (new_value, now, name))
-        
-        conn.commit()
-        conn.close()
+
+        conn = _get_conn(db_path)
+
+        row = conn.execute(_SQL_PARAM_GET_VALUE, (name,)).fetchone()
+        if row is not None and math.isclose(row[0], new_value, rel_tol=1e-12):
+            return True, "No change"
+
+        now = _utcnow_iso()
+        with _LOCK:
+            conn.execute(_SQL_PARAM_UPDATE, (new_value, now, name))
+            conn.commit()
         return True, "Parameter updated"
     except Exception as e:
         return False, str(e)
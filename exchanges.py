@@ -3,15 +3,43 @@ Exchange integration module using ccxt library.
 Handles all communication with cryptocurrency exchanges.
 """
 
+import json
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Literal, Any
 import ccxt
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 import config
 from logger import get_logger
 
 logger = get_logger(__name__)
 
+# Credential env-var names per exchange, built once on first use so
+# _init_exchange does plain dict lookups instead of repeated .upper() and
+# f-string construction.
+_ENV_KEYS: dict[str, tuple[str, str]] = {}
+
+
+def _env_keys(exchange_id: str) -> tuple[str, str]:
+    """Return the (api key, secret) env-var names for an exchange."""
+    keys = _ENV_KEYS.get(exchange_id)
+    if keys is None:
+        upper = exchange_id.upper()
+        keys = _ENV_KEYS[exchange_id] = (f"{upper}_API_KEY", f"{upper}_API_SECRET")
+    return keys
+
+
+_ORDER_FMT = "Exchange: %s | Symbol: %s | Side: %s | Type: %s | Amount: %.8f | Price: %s"
+_ORDER_FMT_DRY_RUN = "[DRY_RUN] SIMULATED ORDER: " + _ORDER_FMT
+_ORDER_FMT_CREATED = "ORDER CREATED: " + _ORDER_FMT + " | Order ID: %s"
+_ORDER_FMT_FAILED = "Failed to create order: " + _ORDER_FMT + " | Error: %s"
+
 
 class ExchangeManager:
     """Manages connections and operations for multiple cryptocurrency exchanges."""
@@ -23,6 +51,13 @@ class ExchangeManager:
         """
         self.exchanges: dict[str, ccxt.Exchange] = {}
         self.exchange_ids = exchange_ids
+        # Two workers per exchange: ticker and balance fetches can be in
+        # flight for the same exchange at once, so ccxt's rate-limit
+        # sleeps overlap instead of queueing behind each other.
+        self._fetch_pool = ThreadPoolExecutor(
+            max_workers=max(2 * len(exchange_ids), 2),
+            thread_name_prefix="exchange-io"
+        )
 
         for exchange_id in exchange_ids:
             try:
@@ -30,11 +65,15 @@ class ExchangeManager:
             except Exception as e:
                 logger.error(f"Failed to initialize {exchange_id}: {e}")
 
+        # Frozen once after init; iterating it skips the dict-view
+        # allocation and per-id lookups in the per-scan fan-out methods.
+        self._exchange_list: tuple[tuple[str, ccxt.Exchange], ...] = tuple(self.exchanges.items())
+
     def _init_exchange(self, exchange_id: str) -> None:
         """Initialize a single exchange with API credentials from environment."""
-        exchange_id_upper = exchange_id.upper()
-        api_key = os.getenv(f"{exchange_id_upper}_API_KEY", "")
-        api_secret = os.getenv(f"{exchange_id_upper}_API_SECRET", "")
+        key_name, secret_name = _env_keys(exchange_id)
+        api_key = os.environ.get(key_name, "")
+        api_secret = os.environ.get(secret_name, "")
 
         exchange_class = getattr(ccxt, exchange_id, None)
         if exchange_class is None:
@@ -48,22 +87,85 @@ class ExchangeManager:
         }
 
         if exchange_id == "okx":
-            passphrase = os.getenv("OKX_PASSPHRASE", "")
+            passphrase = os.environ.get("OKX_PASSPHRASE", "")
             exchange_config["password"] = passphrase
             exchange_config["hostname"] = "my.okx.com"
 
         self.exchanges[exchange_id] = exchange_class(exchange_config)
         logger.info(f"Initialized exchange: {exchange_id}")
 
-    def load_markets(self) -> None:
-        """Load markets for all initialized exchanges."""
-        for exchange_id, exchange in self.exchanges.items():
-            try:
-                exchange.load_markets()
+    def _markets_cache_path(self, exchange_id: str) -> str:
+        """Path of the on-disk markets cache for an exchange."""
+        return os.path.join(config.MARKETS_CACHE_DIR, f"{exchange_id}.json")
+
+    def _load_cached_markets(self, exchange_id: str, exchange: ccxt.Exchange) -> bool:
+        """
+        Restore markets from the disk cache if it is fresh enough.
+        Returns True on success. Delete the cache file to force a refresh.
+        """
+        path = self._markets_cache_path(exchange_id)
+        try:
+            if time.time() - os.path.getmtime(path) > config.MARKETS_CACHE_TTL_SECONDS:
+                return False
+            with open(path, "rb") as f:
+                raw = f.read()
+            cached = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            exchange.set_markets(cached["markets"], cached.get("currencies"))
+            return True
+        except (OSError, ValueError, KeyError):
+            return False
+
+    def _save_markets_cache(self, exchange_id: str, exchange: ccxt.Exchange) -> None:
+        """Persist freshly loaded markets; best effort, never fatal."""
+        path = self._markets_cache_path(exchange_id)
+        try:
+            os.makedirs(config.MARKETS_CACHE_DIR, exist_ok=True)
+            payload = {"markets": exchange.markets, "currencies": exchange.currencies}
+            if orjson is not None:
+                data = orjson.dumps(payload)
+            else:
+                data = json.dumps(payload).encode()
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except (OSError, TypeError) as e:
+            logger.debug(f"Could not write markets cache for {exchange_id}: {e}")
+
+    def _load_markets_one(self, exchange_id: str, exchange: ccxt.Exchange) -> None:
+        """Load markets for one exchange, from cache when fresh."""
+        try:
+            if self._load_cached_markets(exchange_id, exchange):
                 markets = exchange.markets or {}
-                logger.info(f"Loaded markets for {exchange_id}: {len(markets)} pairs")
-            except Exception as e:
-                logger.error(f"Failed to load markets for {exchange_id}: {e}")
+                logger.info(f"Loaded markets for {exchange_id} from cache: {len(markets)} pairs")
+                return
+            exchange.load_markets()
+            self._save_markets_cache(exchange_id, exchange)
+            markets = exchange.markets or {}
+            logger.info(f"Loaded markets for {exchange_id}: {len(markets)} pairs")
+        except Exception as e:
+            logger.error(f"Failed to load markets for {exchange_id}: {e}")
+
+    def load_markets(self) -> None:
+        """
+        Load markets for all initialized exchanges.
+        The per-exchange loads run concurrently, so startup waits for the
+        slowest exchange rather than the sum of all of them.
+        """
+        futures = [
+            self._fetch_pool.submit(self._load_markets_one, exchange_id, exchange)
+            for exchange_id, exchange in self._exchange_list
+        ]
+        for future in futures:
+            future.result()
+
+    def get_all_balances(self) -> dict[str, dict]:
+        """Fetch free balances from all exchanges concurrently."""
+        futures = {
+            exchange_id: self._fetch_pool.submit(self.get_balances, exchange_id)
+            for exchange_id, _ in self._exchange_list
+        }
+        return {exchange_id: future.result() for exchange_id, future in futures.items()}
 
     def get_exchange(self, exchange_id: str) -> Optional[ccxt.Exchange]:
         """Return the ccxt exchange instance for the given ID."""
@@ -92,6 +194,55 @@ class ExchangeManager:
             logger.error(f"Failed to fetch ticker for {symbol} on {exchange_id}: {e}")
             return None
 
+    def get_tickers(self, exchange_id: str, symbols: list[str]) -> dict[str, dict]:
+        """
+        Fetch tickers for several symbols from one exchange.
+        Uses a single fetch_tickers request when the exchange supports it,
+        collapsing one HTTP round-trip per symbol into one per exchange;
+        falls back to per-symbol fetches otherwise.
+        Returns a mapping of symbol to the internal ticker shape.
+        """
+        exchange = self.exchanges.get(exchange_id)
+        if exchange is None:
+            logger.error(f"Exchange {exchange_id} not initialized")
+            return {}
+
+        if exchange.has.get("fetchTickers"):
+            try:
+                raw = exchange.fetch_tickers(symbols)
+                return {
+                    symbol: {
+                        "bid": ticker.get("bid"),
+                        "ask": ticker.get("ask"),
+                        "last": ticker.get("last"),
+                        "symbol": symbol,
+                        "exchange": exchange_id
+                    }
+                    for symbol, ticker in raw.items()
+                    if symbol in symbols
+                }
+            except Exception as e:
+                logger.error(f"Failed to fetch tickers on {exchange_id}: {e}")
+                return {}
+
+        results: dict[str, dict] = {}
+        for symbol in symbols:
+            ticker = self.get_ticker(exchange_id, symbol)
+            if ticker:
+                results[symbol] = ticker
+        return results
+
+    def get_all_tickers(self, symbols: list[str]) -> dict[str, dict[str, dict]]:
+        """
+        Fetch tickers for the given symbols from every exchange concurrently.
+        Returns {exchange_id: {symbol: ticker}}.
+        """
+        futures = {
+            exchange_id: self._fetch_pool.submit(self.get_tickers, exchange_id, symbols)
+            for exchange_id, _ in self._exchange_list
+        }
+        return {exchange_id: future.result() for exchange_id, future in futures.items()}
+
     def get_balances(self, exchange_id: str) -> dict:
         """
         Fetch current balances for an exchange.
@@ -127,13 +278,12 @@ class ExchangeManager:
             logger.error(f"Exchange {exchange_id} not initialized")
             return {"error": "Exchange not initialized"}
 
-        order_info = (
-            f"Exchange: {exchange_id} | Symbol: {symbol} | Side: {side} | "
-            f"Type: {order_type} | Amount: {amount:.8f} | Price: {price}"
-        )
+        # %-style args so the order description is only formatted when the
+        # record is actually emitted.
+        order_args = (exchange_id, symbol, side, order_type, amount, price)
 
         if config.DRY_RUN:
-            logger.info(f"[DRY_RUN] SIMULATED ORDER: {order_info}")
+            logger.info(_ORDER_FMT_DRY_RUN, *order_args)
             return {
                 "id": "SIMULATED",
                 "symbol": symbol,
@@ -151,8 +301,8 @@ class ExchangeManager:
             else:
                 order = exchange.create_order(symbol, order_type, side, amount, price)  # type: ignore
 
-            logger.info(f"ORDER CREATED: {order_info} | Order ID: {order.get('id')}")
+            logger.info(_ORDER_FMT_CREATED, *order_args, order.get("id"))
             return order
         except Exception as e:
-            logger.error(f"Failed to create order: {order_info} | Error: {e}")
+            logger.error(_ORDER_FMT_FAILED, *order_args, e)
             return {"error": str(e)}
@@ -3,16 +3,25 @@ Logging module for the arbitrage bot.
 Configures console and optional file logging.
 """
 
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
 _configured: bool = False
+_listener: Optional[QueueListener] = None
 
 
 def setup_logging(log_to_file: bool = True, log_file_name: str = "arbitrage_bot.log") -> None:
-    """Configure the root logger with console and optional file handlers."""
-    global _configured
+    """
+    Configure the root logger with console and optional file handlers.
+    Records are passed through a queue and written by a background
+    listener thread, so log calls in the trading loop never block on
+    console or file I/O.
+    """
+    global _configured, _listener
     if _configured:
         return
 
@@ -24,16 +33,27 @@ def setup_logging(log_to_file: bool = True, log_file_name: str = "arbitrage_bot.
         datefmt="%Y-%m-%d %H:%M:%S"
     )
 
+    handlers: list[logging.Handler] = []
+
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(logging.INFO)
     console_handler.setFormatter(formatter)
-    root_logger.addHandler(console_handler)
+    handlers.append(console_handler)
 
     if log_to_file:
-        file_handler = logging.FileHandler(log_file_name, mode="a", encoding="utf-8")
+        file_handler = logging.FileHandler(
+            log_file_name, mode="a", encoding="utf-8", delay=True
+        )
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(formatter)
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    log_queue: queue.Queue = queue.Queue(-1)
+    root_logger.addHandler(QueueHandler(log_queue))
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
 
     _configured = True
 
@@ -48,8 +48,28 @@ from arbitrage import find_arbitrage_opportunities, execute_arbitrage_opportunit
 from logger import setup_logging, get_logger
 from utils import load_env, send_alert
 from db import init_db, update_heartbeat, init_parameters
-from shadow import init_shadow_db, simulate_arbitrage, insert_shadow_trade
+from shadow import init_shadow_db, simulate_arbitrage_batch, insert_shadow_trade
 from param_store import get_store, maybe_reload_params
+from optimizer import bootstrap as optimizer_bootstrap
+
+
+# Live-tunable parameter name -> RiskManager attribute, with the cast the
+# attribute expects. Config holds the fallback under the same name.
+_PARAM_TO_ATTR: tuple[tuple[str, str, type], ...] = (
+    ("MAX_CAPITAL_PER_TRADE_USD", "max_capital_per_trade_usd", float),
+    ("MAX_DAILY_LOSS_USD", "max_daily_loss_usd", float),
+    ("MAX_TRADES_PER_HOUR", "max_trades_per_hour", int),
+    ("MAX_SYMBOL_EXPOSURE_USD", "max_symbol_exposure_usd", float),
+    ("VOLATILITY_THRESHOLD_PERCENT", "volatility_threshold", float),
+    ("MAX_BALANCE_USAGE_PER_EXCHANGE", "max_balance_usage_per_exchange", float),
+)
+
+
+def _refresh_risk(risk_manager: RiskManager, param_store) -> None:
+    """Snapshot the live-tunable parameters into the risk manager."""
+    for param_name, attr, cast in _PARAM_TO_ATTR:
+        fallback = getattr(config, param_name)
+        setattr(risk_manager, attr, cast(param_store.get_param(param_name, fallback)))
 
 
 def main() -> None:
@@ -65,6 +85,7 @@ def main() -> None:
     init_db()
     init_shadow_db()
     init_parameters()
+    optimizer_bootstrap()
     
     param_store = get_store()
     logger.info(f"Databases initialized, {len(param_store.get_all())} parameters loaded")
@@ -88,17 +109,19 @@ def main() -> None:
     exchange_manager.load_markets()
 
     risk_manager = RiskManager(
-        max_capital_per_trade_usd=param_store.get_param("MAX_CAPITAL_PER_TRADE_USD", config.MAX_CAPITAL_PER_TRADE_USD),
-        max_daily_loss_usd=param_store.get_param("MAX_DAILY_LOSS_USD", config.MAX_DAILY_LOSS_USD),
+        max_capital_per_trade_usd=config.MAX_CAPITAL_PER_TRADE_USD,
+        max_daily_loss_usd=config.MAX_DAILY_LOSS_USD,
         max_open_trades=config.MAX_OPEN_TRADES,
-        max_balance_usage_per_exchange=param_store.get_param("MAX_BALANCE_USAGE_PER_EXCHANGE", config.MAX_BALANCE_USAGE_PER_EXCHANGE),
-        max_trades_per_hour=int(param_store.get_param("MAX_TRADES_PER_HOUR", config.MAX_TRADES_PER_HOUR)),
+        max_balance_usage_per_exchange=config.MAX_BALANCE_USAGE_PER_EXCHANGE,
+        max_trades_per_hour=config.MAX_TRADES_PER_HOUR,
         max_api_errors=config.MAX_API_ERRORS_PER_WINDOW,
         api_error_window=config.API_ERROR_WINDOW_SECONDS,
-        volatility_threshold=param_store.get_param("VOLATILITY_THRESHOLD_PERCENT", config.VOLATILITY_THRESHOLD_PERCENT),
+        volatility_threshold=config.VOLATILITY_THRESHOLD_PERCENT,
         volatility_window=config.VOLATILITY_WINDOW_SIZE,
-        max_symbol_exposure_usd=param_store.get_param("MAX_SYMBOL_EXPOSURE_USD", config.MAX_SYMBOL_EXPOSURE_USD)
+        max_symbol_exposure_usd=config.MAX_SYMBOL_EXPOSURE_USD
     )
+    _refresh_risk(risk_manager, param_store)
+    last_param_version = param_store.version
 
     balance_refresh_counter = 0
     balance_refresh_interval = 6
@@ -112,19 +135,18 @@ def main() -> None:
     try:
         while True:
             loop_counter += 1
+            now = time.time()
             prune_completed_trades()
 
-            if time.time() - last_heartbeat_time >= config.HEARTBEAT_INTERVAL:
+            if now - last_heartbeat_time >= config.HEARTBEAT_INTERVAL:
                 update_heartbeat()
-                last_heartbeat_time = time.time()
+                last_heartbeat_time = now
                 logger.debug("Heartbeat updated")
             
             maybe_reload_params()
-            risk_manager.max_capital_per_trade_usd = param_store.get_param("MAX_CAPITAL_PER_TRADE_USD", config.MAX_CAPITAL_PER_TRADE_USD)
-            risk_manager.max_daily_loss_usd = param_store.get_param("MAX_DAILY_LOSS_USD", config.MAX_DAILY_LOSS_USD)
-            risk_manager.max_trades_per_hour = int(param_store.get_param("MAX_TRADES_PER_HOUR", config.MAX_TRADES_PER_HOUR))
-            risk_manager.max_symbol_exposure_usd = param_store.get_param("MAX_SYMBOL_EXPOSURE_USD", config.MAX_SYMBOL_EXPOSURE_USD)
-            risk_manager.volatility_threshold = param_store.get_param("VOLATILITY_THRESHOLD_PERCENT", config.VOLATILITY_THRESHOLD_PERCENT)
+            if param_store.version != last_param_version:
+                _refresh_risk(risk_manager, param_store)
+                last_param_version = param_store.version
 
             if not check_api_error_limit(config.MAX_API_ERRORS_PER_WINDOW, config.API_ERROR_WINDOW_SECONDS):
                 set_trading_enabled(False, "API error limit exceeded")
@@ -142,12 +164,11 @@ def main() -> None:
 
             if balance_refresh_counter % balance_refresh_interval == 0:
                 logger.debug("Refreshing balances from exchanges...")
-                for exchange_id in config.SUPPORTED_EXCHANGES:
-                    try:
-                        balances[exchange_id] = exchange_manager.get_balances(exchange_id)
-                    except Exception as e:
-                        logger.error(f"Error fetching balances from {exchange_id}: {e}")
-                        record_api_error()
+                try:
+                    balances.update(exchange_manager.get_all_balances())
+                except Exception as e:
+                    logger.error(f"Error fetching balances: {e}")
+                    record_api_error()
                 balance_refresh_counter = 0
 
             balance_refresh_counter += 1
@@ -171,7 +192,7 @@ def main() -> None:
                 max_slippage_percent=config.MAX_SLIPPAGE_PERCENT
             )
 
-            if check_no_data_timeout(config.NO_DATA_ALERT_SECONDS):
+            if check_no_data_timeout(config.NO_DATA_ALERT_SECONDS, now=now):
                 if not no_data_alert_sent:
                     logger.warning(f"No opportunities found for {config.NO_DATA_ALERT_SECONDS}s")
                     send_alert(
@@ -182,13 +203,21 @@ def main() -> None:
             else:
                 no_data_alert_sent = False
 
+            if not opportunities:
+                logger.info(
+                    f"Loop #{loop_counter}: Found 0 opportunities, "
+                    f"daily PnL: ${risk_manager.current_daily_pnl_usd:.2f}, "
+                    f"trades/hour: {get_trades_this_hour()}"
+                )
+                time.sleep(config.REFRESH_INTERVAL_SECONDS)
+                continue
+
             if config.SHADOW_TRADING_ENABLED:
-                for opp in opportunities:
-                    shadow_result = simulate_arbitrage(opp, balances, config)
-                    if shadow_result:
-                        insert_shadow_trade(shadow_result)
+                for shadow_result in simulate_arbitrage_batch(opportunities, balances, config):
+                    insert_shadow_trade(shadow_result)
 
             executed_count = 0
+            trades_this_hour = get_trades_this_hour()
 
             for opportunity in opportunities:
                 current_open_trades = get_open_trades_count()
@@ -196,7 +225,7 @@ def main() -> None:
                     logger.info("Max open trades reached, skipping remaining opportunities")
                     break
 
-                if get_trades_this_hour() >= config.MAX_TRADES_PER_HOUR:
+                if trades_this_hour + executed_count >= config.MAX_TRADES_PER_HOUR:
                     logger.warning("Max trades per hour reached, entering read-only mode")
                     break
 
@@ -226,12 +255,13 @@ def main() -> None:
         logger.info(f"Final daily PnL: ${risk_manager.current_daily_pnl_usd:.2f}")
         send_alert(
             f"Bot stopped. Final PnL: ${risk_manager.current_daily_pnl_usd:.2f}",
-            "Bot Shutdown"
+            "Bot Shutdown",
+            wait=True
         )
         sys.exit(0)
     except Exception as e:
         logger.error(f"Unexpected error: {e}")
-        send_alert(f"Bot crashed with error: {e}", "Bot Error")
+        send_alert(f"Bot crashed with error: {e}", "Bot Error", wait=True)
         raise
 
 
@@ -3,9 +3,12 @@ Automatic optimization module for the arbitrage bot.
 Analyzes performance and adjusts parameters dynamically.
 """
 
+import atexit
 import sqlite3
-from datetime import datetime, timedelta
-from typing import Optional
+import threading
+import time
+from datetime import datetime
+from typing import NamedTuple, Optional
 
 from logger import get_logger
 import config
@@ -14,10 +17,62 @@ logger = get_logger(__name__)
 
 DEFAULT_DB_PATH = "trades.db"
 
+# Database files already switched to WAL; the journal mode persists in the
+# file, so later opens skip that pragma.
+_WAL_ENABLED: set[str] = set()
+
+
+def _open(db_path: str) -> sqlite3.Connection:
+    """Open a connection with the performance pragmas applied."""
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    if db_path not in _WAL_ENABLED:
+        conn.execute("PRAGMA journal_mode=WAL")
+        _WAL_ENABLED.add(db_path)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA cache_size=-20000")
+    return conn
+
+
+_conn_cache: dict[tuple[int, str], sqlite3.Connection] = {}
+
+
+def _get_conn(db_path: str) -> sqlite3.Connection:
+    """
+    Return this thread's cached connection for a database, opening it on
+    first use. Long-lived connections keep SQLite's page cache and parsed
+    schema warm instead of rebuilding them on every call.
+    """
+    key = (threading.get_ident(), db_path)
+    conn = _conn_cache.get(key)
+    if conn is None:
+        conn = _conn_cache[key] = _open(db_path)
+    return conn
+
+
+def _close_conns() -> None:
+    """Close all cached connections at interpreter exit."""
+    for conn in _conn_cache.values():
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    _conn_cache.clear()
+
+
+atexit.register(_close_conns)
+
+
+_tables_ready: set[str] = set()
+
 
 def init_parameters_table(db_path: str = DEFAULT_DB_PATH) -> None:
     """Initialize the parameters table for dynamic configuration."""
-    conn = sqlite3.connect(db_path)
+    if db_path in _tables_ready:
+        return
+
+    conn = _get_conn(db_path)
     cursor = conn.cursor()
 
     cursor.execute('''
@@ -59,118 +114,367 @@ def init_parameters_table(db_path: str = DEFAULT_DB_PATH) -> None:
         )
     ''')
 
+    init_trade_indexes(db_path)
+
+    conn.commit()
+    _tables_ready.add(db_path)
+
+
+def init_trade_indexes(db_path: str = DEFAULT_DB_PATH) -> None:
+    """
+    Create the indexes backing the optimizer's aggregation queries.
+    The trades table is owned by db.py and may not exist yet when the
+    optimizer initializes first, so each statement fails soft.
+    """
+    conn = _get_conn(db_path)
+    cursor = conn.cursor()
+
+    try:
+        # table_xinfo, not table_info: the latter hides generated columns.
+        cursor.execute("PRAGMA table_xinfo(trades)")
+        columns = {row[1] for row in cursor.fetchall()}
+        if columns and "timestamp_unix" not in columns:
+            cursor.execute('''
+                ALTER TABLE trades ADD COLUMN timestamp_unix INTEGER
+                GENERATED ALWAYS AS (CAST(strftime('%s', timestamp) AS INTEGER)) VIRTUAL
+            ''')
+    except sqlite3.OperationalError as e:
+        logger.debug(f"Skipping timestamp_unix column: {e}")
+
+    for statement in (
+        'DROP INDEX IF EXISTS idx_trades_symbol_ts',
+        'DROP INDEX IF EXISTS idx_trades_exch_ts',
+        'CREATE INDEX IF NOT EXISTS idx_trades_symbol_tsu ON trades(symbol, timestamp_unix)',
+        'CREATE INDEX IF NOT EXISTS idx_trades_exch_tsu ON trades(buy_exchange, sell_exchange, timestamp_unix)',
+        'CREATE INDEX IF NOT EXISTS idx_perf_scores_computed ON performance_scores(computed_at)',
+    ):
+        try:
+            cursor.execute(statement)
+        except sqlite3.OperationalError as e:
+            logger.debug(f"Skipping index creation: {e}")
+
     conn.commit()
-    conn.close()
+
+
+# (unix second, ISO string) of the last formatted timestamp. Writes land
+# at second granularity anyway, so reformatting within the same second
+# just burns a datetime allocation and strftime call.
+_now_iso_cache: tuple[int, str] = (0, "")
+
+
+def _utcnow_iso() -> str:
+    """Current UTC time as an ISO string, reformatted at most once a second."""
+    global _now_iso_cache
+    now = int(time.time())
+    if now != _now_iso_cache[0]:
+        _now_iso_cache = (now, datetime.utcnow().isoformat())
+    return _now_iso_cache[1]
+
+
+def bootstrap(db_path: str = DEFAULT_DB_PATH) -> None:
+    """
+    Run the optimizer's schema setup once at process start.
+    Writers used to call init_parameters_table themselves, which put
+    CREATE TABLE statements and their schema locks on every write path;
+    entry points call this instead and the writers assume the tables
+    exist.
+    """
+    init_parameters_table(db_path)
+
+
+# SQL for the hot read/write paths lives at module level so every call
+# passes the identical string object to execute() and hits the
+# connection's prepared-statement cache instead of re-preparing.
+_SQL_GET_PARAM = 'SELECT value FROM parameters WHERE param_name = ?'
+
+_SQL_UPSERT_PARAM = '''
+    INSERT INTO parameters (param_name, value, min_value, max_value, updated_at, updated_by, previous_value)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(param_name) DO UPDATE SET
+        value = excluded.value,
+        updated_at = excluded.updated_at,
+        updated_by = excluded.updated_by,
+        previous_value = parameters.value
+'''
+
+_SQL_INSERT_PARAM_HISTORY = '''
+    INSERT INTO parameter_history (param_name, old_value, new_value, changed_at, changed_by, reason)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+# Index-only probes that let the compute_* functions skip the full
+# aggregation when a route has no trades in the window.
+_SQL_PAIR_HAS_TRADES = 'SELECT 1 FROM trades WHERE symbol = ? AND timestamp_unix >= ? LIMIT 1'
+_SQL_EXCHANGE_PAIR_HAS_TRADES = (
+    'SELECT 1 FROM trades WHERE buy_exchange = ? AND sell_exchange = ? AND timestamp_unix >= ? LIMIT 1'
+)
+
+_SQL_PAIR_PERFORMANCE = '''
+    SELECT 
+        COUNT(*) as trade_count,
+        COALESCE(AVG(pnl_usd), 0) as avg_pnl,
+        COALESCE(AVG(net_spread_percent), 0) as avg_spread,
+        COALESCE(MAX(pnl_usd), 0) as best_pnl,
+        COALESCE(MIN(pnl_usd), 0) as worst_pnl,
+        SUM(CASE WHEN pnl_usd > 0 THEN 1 ELSE 0 END) as wins
+    FROM trades
+    WHERE symbol = ? AND timestamp_unix >= ?
+'''
+
+# Formatted once per call with the IN-list placeholders; the symbol
+# count is stable in practice, so the cache still gets identity hits.
+_SQL_ALL_PAIR_PERFORMANCE_FMT = '''
+    SELECT 
+        symbol,
+        COUNT(*) as trade_count,
+        COALESCE(AVG(pnl_usd), 0) as avg_pnl,
+        COALESCE(AVG(net_spread_percent), 0) as avg_spread,
+        COALESCE(MAX(pnl_usd), 0) as best_pnl,
+        COALESCE(MIN(pnl_usd), 0) as worst_pnl,
+        SUM(CASE WHEN pnl_usd > 0 THEN 1 ELSE 0 END) as wins
+    FROM trades
+    WHERE timestamp_unix >= ? AND symbol IN ({placeholders})
+    GROUP BY symbol
+'''
+
+_SQL_EXCHANGE_PAIR_PERFORMANCE = '''
+    SELECT 
+        COUNT(*) as trade_count,
+        COALESCE(AVG(pnl_usd), 0) as avg_pnl,
+        COALESCE(SUM(fees_estimated), 0) as total_fees,
+        SUM(CASE WHEN pnl_usd > 0 THEN 1 ELSE 0 END) as wins
+    FROM trades
+    WHERE buy_exchange = ? AND sell_exchange = ? AND timestamp_unix >= ?
+'''
+
+_SQL_INSERT_SCORE = '''
+    INSERT INTO performance_scores 
+    (symbol, buy_exchange, sell_exchange, avg_pnl, win_rate, trade_count, avg_slippage, score, computed_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_PNL_SUMMARY_REAL = '''
+    SELECT 
+        COUNT(*) as trade_count,
+        COALESCE(AVG(pnl_usd), 0) as avg_pnl,
+        COALESCE(SUM(pnl_usd), 0) as total_pnl,
+        SUM(CASE WHEN pnl_usd > 0 THEN 1 ELSE 0 END) as wins
+    FROM trades
+    WHERE timestamp_unix >= ?
+'''
+
+_SQL_PNL_SUMMARY_SHADOW = '''
+    SELECT
+        COUNT(*) as trade_count,
+        COALESCE(AVG(pnl_usd), 0) as avg_pnl,
+        COALESCE(SUM(pnl_usd), 0) as total_pnl,
+        SUM(CASE WHEN pnl_usd > 0 THEN 1 ELSE 0 END) as wins
+    FROM shadow.shadow_trades
+    WHERE timestamp >= ?
+'''
+
+
+# Short-lived read cache so the per-opportunity code path resolves
+# parameters with a dict hit instead of a SQLite query. Writers pop the
+# keys they touch; the TTL matches ParameterStore's reload interval so
+# out-of-process changes surface just as fast.
+_PARAM_CACHE_TTL_SECONDS = 5.0
+_param_cache: dict[tuple[str, str], tuple[float, float]] = {}
 
 
 def get_parameter(param_name: str, default: float, db_path: str = DEFAULT_DB_PATH) -> float:
     """Get a parameter value from the database, or return default."""
+    key = (db_path, param_name)
+    cached = _param_cache.get(key)
+    if cached is not None and cached[1] > time.monotonic():
+        return cached[0]
+
     try:
-        conn = sqlite3.connect(db_path)
+        conn = _get_conn(db_path)
         cursor = conn.cursor()
-        cursor.execute('SELECT value FROM parameters WHERE param_name = ?', (param_name,))
+        cursor.execute(_SQL_GET_PARAM, (param_name,))
         row = cursor.fetchone()
-        conn.close()
-        return row[0] if row else default
+        if row is None:
+            return default
+        _param_cache[key] = (row[0], time.monotonic() + _PARAM_CACHE_TTL_SECONDS)
+        return row[0]
     except Exception as e:
         logger.debug(f"Error getting parameter {param_name}: {e}")
         return default
 
 
-def set_parameter(
-    param_name: str,
-    value: float,
-    updated_by: str = "optimizer",
-    min_value: Optional[float] = None,
-    max_value: Optional[float] = None,
+def set_parameters_bulk(
+    items: list[tuple[str, float, str, Optional[float], Optional[float]]],
     db_path: str = DEFAULT_DB_PATH
 ) -> bool:
-    """Set a parameter value in the database with change tracking."""
+    """
+    Set several parameters in one transaction.
+    items holds (param_name, value, updated_by, min_value, max_value)
+    tuples; all writes share a single BEGIN IMMEDIATE / COMMIT, so a
+    batch costs one fsync instead of one per parameter.
+    """
     try:
-        init_parameters_table(db_path)
-        conn = sqlite3.connect(db_path)
+        conn = _get_conn(db_path)
         cursor = conn.cursor()
+        now = _utcnow_iso()
 
-        cursor.execute('SELECT value FROM parameters WHERE param_name = ?', (param_name,))
-        row = cursor.fetchone()
-        old_value = row[0] if row else None
-
-        if old_value is not None:
-            max_change = abs(old_value) * (config.PARAMETER_CHANGE_LIMIT_PERCENT / 100)
-            if abs(value - old_value) > max_change:
-                if value > old_value:
-                    value = old_value + max_change
-                else:
-                    value = old_value - max_change
-                logger.warning(f"Parameter change limited: {param_name} capped at {value:.4f}")
-
-        now = datetime.utcnow().isoformat()
-
-        cursor.execute('''
-            INSERT INTO parameters (param_name, value, min_value, max_value, updated_at, updated_by, previous_value)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-            ON CONFLICT(param_name) DO UPDATE SET
-                value = excluded.value,
-                updated_at = excluded.updated_at,
-                updated_by = excluded.updated_by,
-                previous_value = parameters.value
-        ''', (param_name, value, min_value, max_value, now, updated_by, old_value))
-
-        cursor.execute('''
-            INSERT INTO parameter_history (param_name, old_value, new_value, changed_at, changed_by, reason)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (param_name, old_value, value, now, updated_by, "automatic_optimization"))
+        param_rows = []
+        history_rows = []
 
-        conn.commit()
-        conn.close()
+        cursor.execute("BEGIN IMMEDIATE")
+        for param_name, value, updated_by, min_value, max_value in items:
+            cursor.execute(_SQL_GET_PARAM, (param_name,))
+            row = cursor.fetchone()
+            old_value = row[0] if row else None
+
+            if old_value is not None:
+                max_change = abs(old_value) * (config.PARAMETER_CHANGE_LIMIT_PERCENT / 100)
+                if abs(value - old_value) > max_change:
+                    if value > old_value:
+                        value = old_value + max_change
+                    else:
+                        value = old_value - max_change
+                    logger.warning(f"Parameter change limited: {param_name} capped at {value:.4f}")
+
+            param_rows.append((param_name, value, min_value, max_value, now, updated_by, old_value))
+            history_rows.append((param_name, old_value, value, now, updated_by, "automatic_optimization"))
+            logger.info(f"Parameter updated: {param_name} = {value:.4f} (was {old_value})")
 
-        logger.info(f"Parameter updated: {param_name} = {value:.4f} (was {old_value})")
+        cursor.executemany(_SQL_UPSERT_PARAM, param_rows)
+
+        cursor.executemany(_SQL_INSERT_PARAM_HISTORY, history_rows)
+
+        conn.commit()
+        for param_name, _, _, _, _ in items:
+            _param_cache.pop((db_path, param_name), None)
         return True
     except Exception as e:
-        logger.error(f"Error setting parameter {param_name}: {e}")
+        logger.error(f"Error setting parameters in bulk: {e}")
+        try:
+            _get_conn(db_path).rollback()
+        except Exception:
+            pass
         return False
 
 
-def compute_pair_performance(symbol: str, days: int = 14, db_path: str = DEFAULT_DB_PATH) -> dict:
+def set_parameter(
+    param_name: str,
+    value: float,
+    updated_by: str = "optimizer",
+    min_value: Optional[float] = None,
+    max_value: Optional[float] = None,
+    db_path: str = DEFAULT_DB_PATH
+) -> bool:
+    """Set a parameter value in the database with change tracking."""
+    return set_parameters_bulk(
+        [(param_name, value, updated_by, min_value, max_value)], db_path=db_path
+    )
+
+
+class PerfStats(NamedTuple):
+    """
+    Aggregated trade performance for a pair or exchange route.
+    Immutable and allocated from one tuple instead of a dict of string
+    keys per call; a dict-style get() is kept so existing callers that
+    treat stats as a mapping keep working. Values are unrounded — display
+    rounding belongs to whatever renders them.
+    """
+    symbol: str = ""
+    buy_exchange: str = ""
+    sell_exchange: str = ""
+    trade_count: int = 0
+    avg_pnl_per_trade: float = 0.0
+    avg_spread: float = 0.0
+    best_pnl: float = 0.0
+    worst_pnl: float = 0.0
+    win_rate: float = 0.5
+    avg_slippage: float = 0.0
+    avg_pnl: float = 0.0
+    total_fees: float = 0.0
+
+    def get(self, key: str, default=None):
+        """Mapping-style field access for dict-era call sites."""
+        return getattr(self, key, default)
+
+
+def compute_pair_performance(symbol: str, days: int = 14, db_path: str = DEFAULT_DB_PATH) -> PerfStats:
     """Compute performance statistics for a trading pair."""
     try:
-        conn = sqlite3.connect(db_path)
+        conn = _get_conn(db_path)
         cursor = conn.cursor()
 
-        start_date = (datetime.utcnow() - timedelta(days=days)).isoformat()
+        cutoff = int(time.time()) - days * 86400
+
+        cursor.execute(_SQL_PAIR_HAS_TRADES, (symbol, cutoff))
+        if cursor.fetchone() is None:
+            return PerfStats(symbol=symbol)
 
-        cursor.execute('''
-            SELECT 
-                COUNT(*) as trade_count,
-                COALESCE(AVG(pnl_usd), 0) as avg_pnl,
-                COALESCE(AVG(net_spread_percent), 0) as avg_spread,
-                COALESCE(MAX(pnl_usd), 0) as best_pnl,
-                COALESCE(MIN(pnl_usd), 0) as worst_pnl,
-                SUM(CASE WHEN pnl_usd > 0 THEN 1 ELSE 0 END) as wins
-            FROM trades
-            WHERE symbol = ? AND timestamp >= ?
-        ''', (symbol, start_date))
+        cursor.execute(_SQL_PAIR_PERFORMANCE, (symbol, cutoff))
 
         row = cursor.fetchone()
-        conn.close()
 
         trade_count = row[0] or 0
         wins = row[5] or 0
         win_rate = (wins / trade_count) if trade_count > 0 else 0.5
 
-        return {
-            "symbol": symbol,
-            "trade_count": trade_count,
-            "avg_pnl_per_trade": round(row[1] or 0, 4),
-            "avg_spread": round(row[2] or 0, 4),
-            "best_pnl": round(row[3] or 0, 2),
-            "worst_pnl": round(row[4] or 0, 2),
-            "win_rate": round(win_rate, 4),
-            "avg_slippage": 0.0
-        }
+        return PerfStats(
+            symbol=symbol,
+            trade_count=trade_count,
+            avg_pnl_per_trade=row[1] or 0.0,
+            avg_spread=row[2] or 0.0,
+            best_pnl=row[3] or 0.0,
+            worst_pnl=row[4] or 0.0,
+            win_rate=win_rate
+        )
     except Exception as e:
         logger.error(f"Error computing pair performance for {symbol}: {e}")
-        return {"symbol": symbol, "trade_count": 0, "win_rate": 0.5, "avg_pnl_per_trade": 0}
+        return PerfStats(symbol=symbol)
+
+
+def compute_all_pair_performance(
+    symbols: list[str],
+    days: int = 14,
+    db_path: str = DEFAULT_DB_PATH
+) -> dict[str, PerfStats]:
+    """
+    Compute performance statistics for several trading pairs in one query.
+    One GROUP BY scan replaces a per-symbol aggregation pass; symbols with
+    no trades in the window get the same zero-row shape
+    compute_pair_performance returns.
+    """
+    results = {symbol: PerfStats(symbol=symbol) for symbol in symbols}
+    if not symbols:
+        return results
+
+    try:
+        conn = _get_conn(db_path)
+        cursor = conn.cursor()
+
+        cutoff = int(time.time()) - days * 86400
+        placeholders = ','.join('?' * len(symbols))
+
+        cursor.execute(
+            _SQL_ALL_PAIR_PERFORMANCE_FMT.format(placeholders=placeholders),
+            (cutoff, *symbols)
+        )
+
+        for row in cursor.fetchall():
+            trade_count = row[1] or 0
+            wins = row[6] or 0
+            win_rate = (wins / trade_count) if trade_count > 0 else 0.5
+            results[row[0]] = PerfStats(
+                symbol=row[0],
+                trade_count=trade_count,
+                avg_pnl_per_trade=row[2] or 0.0,
+                avg_spread=row[3] or 0.0,
+                best_pnl=row[4] or 0.0,
+                worst_pnl=row[5] or 0.0,
+                win_rate=win_rate
+            )
+        return results
+    except Exception as e:
+        logger.error(f"Error computing pair performance: {e}")
+        return results
 
 
 def compute_exchange_pair_performance(
@@ -178,112 +482,116 @@ def compute_exchange_pair_performance(
     sell_exchange: str,
     days: int = 14,
     db_path: str = DEFAULT_DB_PATH
-) -> dict:
+) -> PerfStats:
     """Compute performance statistics for an exchange pair."""
     try:
-        conn = sqlite3.connect(db_path)
+        conn = _get_conn(db_path)
         cursor = conn.cursor()
 
-        start_date = (datetime.utcnow() - timedelta(days=days)).isoformat()
+        cutoff = int(time.time()) - days * 86400
+
+        cursor.execute(_SQL_EXCHANGE_PAIR_HAS_TRADES, (buy_exchange, sell_exchange, cutoff))
+        if cursor.fetchone() is None:
+            return PerfStats(buy_exchange=buy_exchange, sell_exchange=sell_exchange)
 
-        cursor.execute('''
-            SELECT 
-                COUNT(*) as trade_count,
-                COALESCE(AVG(pnl_usd), 0) as avg_pnl,
-                COALESCE(SUM(fees_estimated), 0) as total_fees,
-                SUM(CASE WHEN pnl_usd > 0 THEN 1 ELSE 0 END) as wins
-            FROM trades
-            WHERE buy_exchange = ? AND sell_exchange = ? AND timestamp >= ?
-        ''', (buy_exchange, sell_exchange, start_date))
+        cursor.execute(_SQL_EXCHANGE_PAIR_PERFORMANCE, (buy_exchange, sell_exchange, cutoff))
 
         row = cursor.fetchone()
-        conn.close()
 
         trade_count = row[0] or 0
         wins = row[3] or 0
         win_rate = (wins / trade_count) if trade_count > 0 else 0.5
 
-        return {
-            "buy_exchange": buy_exchange,
-            "sell_exchange": sell_exchange,
-            "trade_count": trade_count,
-            "avg_pnl": round(row[1] or 0, 4),
-            "total_fees": round(row[2] or 0, 2),
-            "win_rate": round(win_rate, 4)
-        }
+        return PerfStats(
+            buy_exchange=buy_exchange,
+            sell_exchange=sell_exchange,
+            trade_count=trade_count,
+            avg_pnl=row[1] or 0.0,
+            total_fees=row[2] or 0.0,
+            win_rate=win_rate
+        )
     except Exception as e:
         logger.error(f"Error computing exchange pair performance: {e}")
-        return {"buy_exchange": buy_exchange, "sell_exchange": sell_exchange, "trade_count": 0}
+        return PerfStats(buy_exchange=buy_exchange, sell_exchange=sell_exchange)
+
+
+def save_performance_scores_bulk(
+    triples: list[tuple[str, str, str, PerfStats]],
+    db_path: str = DEFAULT_DB_PATH
+) -> None:
+    """
+    Save performance scores for several (symbol, buy, sell) routes in one
+    transaction. A score pass over every route used to pay one commit —
+    one fsync — per row; batching them leaves a single commit.
+    """
+    if not triples:
+        return
+    try:
+        conn = _get_conn(db_path)
+        now = _utcnow_iso()
+
+        rows = []
+        for symbol, buy_exchange, sell_exchange, stats in triples:
+            score = stats.avg_pnl_per_trade * stats.win_rate - stats.avg_slippage
+            rows.append((
+                symbol, buy_exchange, sell_exchange,
+                stats.avg_pnl_per_trade,
+                stats.win_rate,
+                stats.trade_count,
+                stats.avg_slippage,
+                score,
+                now
+            ))
+
+        cursor = conn.cursor()
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.executemany(_SQL_INSERT_SCORE, rows)
+        conn.commit()
+    except Exception as e:
+        logger.error(f"Error saving performance scores: {e}")
+        try:
+            _get_conn(db_path).rollback()
+        except Exception:
+            pass
 
 
 def save_performance_score(
     symbol: str,
     buy_exchange: str,
     sell_exchange: str,
-    stats: dict,
+    stats: PerfStats,
     db_path: str = DEFAULT_DB_PATH
 ) -> None:
-    """Save performance score to database."""
-    try:
-        init_parameters_table(db_path)
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+    """Save a single performance score to the database."""
+    save_performance_scores_bulk([(symbol, buy_exchange, sell_exchange, stats)], db_path=db_path)
 
-        score = (stats.get("avg_pnl_per_trade", 0) * stats.get("win_rate", 0.5) 
-                 - stats.get("avg_slippage", 0))
-
-        cursor.execute('''
-            INSERT INTO performance_scores 
-            (symbol, buy_exchange, sell_exchange, avg_pnl, win_rate, trade_count, avg_slippage, score, computed_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            symbol, buy_exchange, sell_exchange,
-            stats.get("avg_pnl_per_trade", 0),
-            stats.get("win_rate", 0.5),
-            stats.get("trade_count", 0),
-            stats.get("avg_slippage", 0),
-            score,
-            datetime.utcnow().isoformat()
-        ))
 
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        logger.error(f"Error saving performance score: {e}")
+# Connections (by id) that already have the shadow database attached;
+# ATTACH survives for the life of the pooled connection, so it runs once.
+_shadow_attached: set[int] = set()
+
+
+def _attach_shadow(conn: sqlite3.Connection, shadow_db_path: str) -> None:
+    """Attach the shadow database to a pooled connection, once."""
+    key = id(conn)
+    if key in _shadow_attached:
+        return
+    conn.execute("ATTACH DATABASE ? AS shadow", (shadow_db_path,))
+    _shadow_attached.add(key)
 
 
 def compare_shadow_vs_real(days: int = 7, db_path: str = DEFAULT_DB_PATH, shadow_db_path: str = "shadow.db") -> dict:
     """Compare shadow trading results with real trading results."""
     try:
-        start_date = (datetime.utcnow() - timedelta(days=days)).isoformat()
-
-        conn_real = sqlite3.connect(db_path)
-        cursor_real = conn_real.cursor()
-        cursor_real.execute('''
-            SELECT 
-                COUNT(*) as trade_count,
-                COALESCE(AVG(pnl_usd), 0) as avg_pnl,
-                COALESCE(SUM(pnl_usd), 0) as total_pnl,
-                SUM(CASE WHEN pnl_usd > 0 THEN 1 ELSE 0 END) as wins
-            FROM trades
-            WHERE timestamp >= ?
-        ''', (start_date,))
-        real_row = cursor_real.fetchone()
-        conn_real.close()
-
-        conn_shadow = sqlite3.connect(shadow_db_path)
-        cursor_shadow = conn_shadow.cursor()
-        cursor_shadow.execute('''
-            SELECT 
-                COUNT(*) as trade_count,
-                COALESCE(AVG(pnl_usd), 0) as avg_pnl,
-                COALESCE(SUM(pnl_usd), 0) as total_pnl,
-                SUM(CASE WHEN pnl_usd > 0 THEN 1 ELSE 0 END) as wins
-            FROM shadow_trades
-            WHERE timestamp >= ?
-        ''', (start_date,))
-        shadow_row = cursor_shadow.fetchone()
-        conn_shadow.close()
+        cutoff = int(time.time()) - days * 86400
+
+        conn = _get_conn(db_path)
+        _attach_shadow(conn, shadow_db_path)
+        cursor = conn.cursor()
+        cursor.execute(_SQL_PNL_SUMMARY_REAL, (cutoff,))
+        real_row = cursor.fetchone()
+        cursor.execute(_SQL_PNL_SUMMARY_SHADOW, (cutoff,))
+        shadow_row = cursor.fetchone()
 
         real_trades = real_row[0] or 0
         shadow_trades = shadow_row[0] or 0
@@ -311,18 +619,18 @@ def compare_shadow_vs_real(days: int = 7, db_path: str = DEFAULT_DB_PATH, shadow
 def run_daily_optimization(db_path: str = DEFAULT_DB_PATH) -> dict:
     """Run daily optimization to adjust parameters based on performance."""
     try:
-        init_parameters_table(db_path)
+        bootstrap(db_path)
         results = {}
 
         comparison = compare_shadow_vs_real(days=7, db_path=db_path)
         results["comparison"] = comparison
 
-        for symbol in config.TRADING_PAIRS:
-            stats = compute_pair_performance(symbol, days=7, db_path=db_path)
+        all_stats = compute_all_pair_performance(config.TRADING_PAIRS, days=7, db_path=db_path)
+        for symbol, stats in all_stats.items():
             results[symbol] = stats
 
-            if stats.get("trade_count", 0) >= 10:
-                if stats.get("win_rate", 0.5) < 0.4:
+            if stats.trade_count >= 10:
+                if stats.win_rate < 0.4:
                     logger.warning(f"Symbol {symbol} has low win rate, consider disabling")
 
         return results
@@ -3,8 +3,10 @@ ParameterStore - Runtime parameter management from database.
 Provides dynamic configuration that can be updated from the dashboard.
 """
 
+import os
 import time
-from typing import Optional
+from types import MappingProxyType
+from typing import Mapping, Optional
 from db import get_all_parameters, get_parameter, init_parameters, DEFAULT_DB_PATH
 from logger import get_logger
 
@@ -20,9 +22,13 @@ class ParameterStore:
     def __init__(self, db_path: str = DEFAULT_DB_PATH, reload_interval: int = 30):
         self.db_path = db_path
         self.reload_interval = reload_interval
-        self._params: dict[str, float] = {}
+        # Immutable view, rebound wholesale on reload. Readers that grab
+        # a local reference see one consistent generation end to end.
+        self._params: Mapping[str, float] = MappingProxyType({})
         self._last_reload: float = 0.0
         self._initialized = False
+        self.version: int = 0
+        self._last_db_mtime: float = 0.0
     
     def initialize(self) -> None:
         """Initialize parameters table and load initial values."""
@@ -37,10 +43,16 @@ class ParameterStore:
     def reload_params(self) -> bool:
         """Reload all parameters from the database."""
         try:
-            params = get_all_parameters(self.db_path)
-            if params:
-                self._params = {p["name"]: p["value"] for p in params}
+            # Taken before the read so a write landing mid-reload is
+            # picked up again by the next mtime check.
+            mtime = self._db_mtime()
+            rows = get_all_parameters(self.db_path)
+            if rows:
+                self._params = MappingProxyType(dict(rows))
                 self._last_reload = time.time()
+                self.version += 1
+                if mtime is not None:
+                    self._last_db_mtime = mtime
                 logger.debug(f"Reloaded {len(self._params)} parameters from database")
                 return True
             return False
@@ -48,33 +60,66 @@ class ParameterStore:
             logger.error(f"Failed to reload parameters: {e}")
             return False
     
+    def _db_mtime(self) -> Optional[float]:
+        """
+        Return the latest mtime of the database and its WAL file.
+        In WAL mode a write often lands only in the -wal file, so the main
+        file's mtime alone can miss a change. None if stat fails.
+        """
+        try:
+            mtime = os.stat(self.db_path).st_mtime
+        except OSError:
+            return None
+        try:
+            wal_mtime = os.stat(f"{self.db_path}-wal").st_mtime
+        except OSError:
+            return mtime
+        return max(mtime, wal_mtime)
+
     def maybe_reload(self) -> None:
-        """Reload parameters if enough time has passed since last reload."""
-        if time.time() - self._last_reload >= self.reload_interval:
-            self.reload_params()
+        """
+        Reload parameters if the reload interval has passed and the
+        database file actually changed since the last load. The common
+        no-change case costs two stat calls, not a query.
+        """
+        if time.time() - self._last_reload < self.reload_interval:
+            return
+        mtime = self._db_mtime()
+        if mtime is not None and mtime <= self._last_db_mtime:
+            self._last_reload = time.time()
+            return
+        self.reload_params()
     
     def get_param(self, name: str, default: Optional[float] = None) -> float:
         """
         Get a parameter value.
         Falls back to default if parameter not found.
         """
-        if name in self._params:
-            return self._params[name]
-        
+        params = self._params
+        value = params.get(name)
+        if value is not None:
+            return value
+
         if default is not None:
             return default
-        
+
         param = get_parameter(name, self.db_path)
         if param:
-            self._params[name] = param["value"]
+            # Copy-on-write: the published view is immutable, so a late
+            # discovery rebuilds and republishes instead of mutating.
+            self._params = MappingProxyType({**params, name: param["value"]})
             return param["value"]
         
         logger.warning(f"Parameter {name} not found, no default provided")
         return 0.0
     
-    def get_all(self) -> dict[str, float]:
-        """Get all cached parameters."""
-        return self._params.copy()
+    def get_all(self) -> Mapping[str, float]:
+        """
+        Get all cached parameters as a read-only view.
+        The view is swapped atomically on reload, so callers can hold it
+        without copying; no per-call allocation is needed.
+        """
+        return self._params
     
     def get_last_reload_time(self) -> float:
         """Get timestamp of last successful reload."""
@@ -3,9 +3,10 @@ Risk management module for the arbitrage bot.
 Contains decision logic, position sizing, circuit breakers, and safety checks.
 """
 
-import time
-from datetime import datetime, timedelta
-from typing import Optional, Any
+# Bound once at import: the hot checks call these every opportunity and
+# a direct global beats the time-module attribute lookup each call.
+from time import monotonic as _monotonic, time as _time
+from typing import Optional, Any, Sequence
 from collections import deque
 
 from logger import get_logger
@@ -15,11 +16,20 @@ logger = get_logger(__name__)
 TRADING_ENABLED: bool = True
 _api_errors: deque = deque()
 _trades_this_hour: deque = deque()
-_last_opportunity_time: float = time.time()
+_last_opportunity_time: float = _time()
 _last_alert_message: str = ""
-_symbol_disabled_until: dict[str, datetime] = {}
+# Monotonic deadlines; a float compare per opportunity instead of a
+# datetime allocation, and immune to wall-clock jumps.
+_symbol_disabled_until: dict[str, float] = {}
 _price_history: dict[str, deque] = {}
 
+# (monotonic expiry, trades_ok, api_ok) from the last rate-limit sweep.
+# should_trade_now reuses it for up to 100ms so bursty opportunity
+# streams don't re-walk both deques per opportunity; recording a trade
+# or an API error invalidates it immediately.
+_RATE_CHECK_TTL = 0.1
+_rate_check_cache: tuple[float, bool, bool] = (0.0, True, True)
+
 
 class RiskManager:
     """Manages trading risk, position sizing, circuit breakers, and limits."""
@@ -91,14 +101,11 @@ class RiskManager:
 
         base_size = min(max_from_capital, max_from_balance)
 
-        if best_spread_percent > 1.0:
-            scaled_size = base_size * 1.2
-        elif best_spread_percent < 0.5:
-            scaled_size = base_size * 0.8
-        else:
-            scaled_size = base_size
+        # Branchless form of the old if/elif ladder: +20% above 1% spread,
+        # -20% below 0.5%, unchanged in between (bools coerce to 0/1).
+        scale = 1.0 + 0.2 * (best_spread_percent > 1.0) - 0.2 * (best_spread_percent < 0.5)
 
-        position_size = min(scaled_size, max_from_capital, max_from_balance)
+        position_size = min(base_size * scale, max_from_capital, max_from_balance)
 
         logger.debug(
             f"Position size for {symbol}: {position_size:.8f} "
@@ -128,15 +135,13 @@ class RiskManager:
         if score < 0:
             logger.info(f"Symbol {symbol} has negative score ({score:.4f}), not trading")
             return 0.0
-        elif score < 0.1:
-            size_usd = min_size_usd
-        elif score > 0.5:
-            size_usd = max_size_usd
-        else:
-            ratio = (score - 0.1) / 0.4
-            size_usd = min_size_usd + ratio * (max_size_usd - min_size_usd)
 
-        return min(size_usd / buy_price, self.max_capital_per_trade_usd / buy_price)
+        # Piecewise-linear mapping score -> [min_size, max_size] via a
+        # clamped ratio; replaces the three-way branch with arithmetic.
+        ratio = max(0.0, min(1.0, (score - 0.1) / 0.4))
+        size_usd = min_size_usd + ratio * (max_size_usd - min_size_usd)
+
+        return min(size_usd, self.max_capital_per_trade_usd) / buy_price
 
     def is_spread_enough(self, spread_percent: float, min_spread_percent: float) -> bool:
         """Check if the spread meets the minimum requirement."""
@@ -152,10 +157,12 @@ class RiskManager:
         self.current_daily_pnl_usd = 0.0
         logger.info("Daily PnL reset to $0.00")
 
-    def check_volatility(self, symbol: str, last_prices: list[float], threshold_percent: float) -> bool:
+    def check_volatility(self, symbol: str, last_prices: Sequence[float], threshold_percent: float) -> bool:
         """
         Check if volatility is within acceptable range.
         Returns True if safe to trade, False if volatility too high.
+        Accepts any sequence, so callers can pass the price-history deque
+        directly without copying it to a list first.
         """
         if len(last_prices) < 2:
             return True
@@ -254,24 +261,29 @@ class RiskManager:
         if not TRADING_ENABLED:
             return False
 
-        if symbol in _symbol_disabled_until:
-            if datetime.utcnow() < _symbol_disabled_until[symbol]:
+        until = _symbol_disabled_until.get(symbol)
+        if until is not None:
+            if _monotonic() < until:
                 logger.debug(f"Symbol {symbol} is temporarily disabled")
                 return False
-            else:
-                del _symbol_disabled_until[symbol]
+            del _symbol_disabled_until[symbol]
 
         if not self.check_daily_loss_limit(self.current_daily_pnl_usd):
             return False
 
-        if not check_trades_per_hour_limit(self.max_trades_per_hour):
-            return False
+        global _rate_check_cache
+        if _monotonic() < _rate_check_cache[0]:
+            trades_ok, api_ok = _rate_check_cache[1], _rate_check_cache[2]
+        else:
+            trades_ok = check_trades_per_hour_limit(self.max_trades_per_hour)
+            api_ok = check_api_error_limit(self.max_api_errors, self.api_error_window)
+            _rate_check_cache = (_monotonic() + _RATE_CHECK_TTL, trades_ok, api_ok)
 
-        if not check_api_error_limit(self.max_api_errors, self.api_error_window):
+        if not trades_ok or not api_ok:
             return False
 
-        if symbol in _price_history:
-            prices = list(_price_history[symbol])
+        prices = _price_history.get(symbol)
+        if prices is not None:
             if not self.check_volatility(symbol, prices, self.volatility_threshold):
                 return False
 
@@ -298,8 +310,9 @@ def set_trading_enabled(enabled: bool, reason: str = "") -> None:
 
 def record_api_error() -> None:
     """Record an API error for circuit breaker tracking."""
-    global _api_errors
-    _api_errors.append(time.time())
+    global _rate_check_cache
+    _api_errors.append(_time())
+    _rate_check_cache = (0.0, True, True)
 
 
 def check_api_error_limit(max_errors: int, window_seconds: int) -> bool:
@@ -307,9 +320,12 @@ def check_api_error_limit(max_errors: int, window_seconds: int) -> bool:
     Check if API errors are within acceptable limits.
     Returns True if OK, False if circuit breaker should trigger.
     """
-    global _api_errors
-    cutoff = time.time() - window_seconds
-    _api_errors = deque([t for t in _api_errors if t > cutoff])
+    cutoff = _time() - window_seconds
+    # Timestamps are appended in order, so expired entries sit at the
+    # front; popping them is amortized O(1) per recorded error versus
+    # rebuilding the deque on every check.
+    while _api_errors and _api_errors[0] <= cutoff:
+        _api_errors.popleft()
 
     if len(_api_errors) >= max_errors:
         logger.error(f"API error limit exceeded: {len(_api_errors)} errors in {window_seconds}s")
@@ -319,8 +335,9 @@ def check_api_error_limit(max_errors: int, window_seconds: int) -> bool:
 
 def record_trade() -> None:
     """Record a trade for hourly limit tracking."""
-    global _trades_this_hour
-    _trades_this_hour.append(time.time())
+    global _rate_check_cache
+    _trades_this_hour.append(_time())
+    _rate_check_cache = (0.0, True, True)
 
 
 def check_trades_per_hour_limit(max_trades: int) -> bool:
@@ -328,9 +345,9 @@ def check_trades_per_hour_limit(max_trades: int) -> bool:
     Check if trades per hour are within limits.
     Returns True if OK, False if limit exceeded.
     """
-    global _trades_this_hour
-    cutoff = time.time() - 3600
-    _trades_this_hour = deque([t for t in _trades_this_hour if t > cutoff])
+    cutoff = _time() - 3600
+    while _trades_this_hour and _trades_this_hour[0] <= cutoff:
+        _trades_this_hour.popleft()
 
     if len(_trades_this_hour) >= max_trades:
         logger.warning(f"Trades per hour limit reached: {len(_trades_this_hour)}/{max_trades}")
@@ -341,31 +358,33 @@ def check_trades_per_hour_limit(max_trades: int) -> bool:
 def record_opportunity_found() -> None:
     """Record that an opportunity was found (for no-data detection)."""
     global _last_opportunity_time
-    _last_opportunity_time = time.time()
+    _last_opportunity_time = _time()
 
 
-def check_no_data_timeout(timeout_seconds: int) -> bool:
+def check_no_data_timeout(timeout_seconds: int, now: Optional[float] = None) -> bool:
     """
     Check if we've gone too long without finding opportunities.
     Returns True if timeout exceeded, False otherwise.
+    Callers that already hold the current time can pass it via now.
     """
-    global _last_opportunity_time
-    elapsed = time.time() - _last_opportunity_time
+    if now is None:
+        now = _time()
+    elapsed = now - _last_opportunity_time
     return elapsed > timeout_seconds
 
 
 def update_price_history(symbol: str, price: float, max_size: int = 10) -> None:
     """Update price history for volatility tracking."""
-    global _price_history
-    if symbol not in _price_history:
-        _price_history[symbol] = deque(maxlen=max_size)
-    _price_history[symbol].append(price)
+    history = _price_history.get(symbol)
+    if history is None:
+        history = _price_history[symbol] = deque(maxlen=max_size)
+    history.append(price)
 
 
 def disable_symbol_temporarily(symbol: str, hours: int) -> None:
     """Temporarily disable trading for a symbol."""
     global _symbol_disabled_until
-    _symbol_disabled_until[symbol] = datetime.utcnow() + timedelta(hours=hours)
+    _symbol_disabled_until[symbol] = _monotonic() + hours * 3600.0
     logger.info(f"Symbol {symbol} disabled for {hours} hours")
 
 
@@ -383,7 +402,7 @@ def get_api_error_count() -> int:
 
 def get_trades_this_hour() -> int:
     """Get number of trades in the last hour."""
-    global _trades_this_hour
-    cutoff = time.time() - 3600
-    _trades_this_hour = deque([t for t in _trades_this_hour if t > cutoff])
+    cutoff = _time() - 3600
+    while _trades_this_hour and _trades_this_hour[0] <= cutoff:
+        _trades_this_hour.popleft()
     return len(_trades_this_hour)
@@ -3,11 +3,18 @@ Shadow trading module for risk-free strategy simulation.
 Simulates trades without executing real orders.
 """
 
+import atexit
 import json
 import sqlite3
-from datetime import datetime
+import threading
+import time
 from typing import Any, Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from logger import get_logger
 import config
 
@@ -15,16 +22,148 @@ logger = get_logger(__name__)
 
 SHADOW_DB_PATH = "shadow.db"
 
+_DEFAULT_TAKER = 0.001
+# Taker rate per exchange, flattened once at import; the simulation
+# needs one dict hit per side instead of two nested get() calls.
+_TAKER: dict[str, float] = {
+    exchange_id: fees.get("taker", _DEFAULT_TAKER)
+    for exchange_id, fees in config.EXCHANGE_FEES.items()
+}
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize to a JSON string, with orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    # Compact separators match orjson's output and drop the padding
+    # whitespace from every stored blob.
+    return json.dumps(obj, separators=(",", ":"))
+
+# Paths already in WAL mode; the setting sticks to the file, so only the
+# first open per database pays the pragma.
+_WAL_ENABLED: set[str] = set()
+
+
+def _open(db_path: str) -> sqlite3.Connection:
+    """Open a shadow-db connection with the performance pragmas set."""
+    # Room for the full statement set; the default 128 is shared with
+    # whatever else runs on the connection.
+    conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=128)
+    if db_path not in _WAL_ENABLED:
+        conn.execute("PRAGMA journal_mode=WAL")
+        _WAL_ENABLED.add(db_path)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA busy_timeout=5000")
+    conn.execute("PRAGMA cache_size=-20000")
+    # Checkpoint every ~1000 pages so batched commits don't let the WAL
+    # file grow unbounded between natural checkpoints.
+    conn.execute("PRAGMA wal_autocheckpoint=1000")
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+_conn_cache: dict[tuple[int, str], sqlite3.Connection] = {}
+
+
+def _get_conn(db_path: str) -> sqlite3.Connection:
+    """
+    Return the calling thread's pooled connection, opening one on first
+    use. Closing after every insert threw away SQLite's page cache, so a
+    stats query right after a write re-read everything from disk.
+    """
+    key = (threading.get_ident(), db_path)
+    conn = _conn_cache.get(key)
+    if conn is None:
+        conn = _conn_cache[key] = _open(db_path)
+    return conn
+
+
+def _close_conns() -> None:
+    """Close pooled connections when the interpreter shuts down."""
+    for conn in _conn_cache.values():
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    _conn_cache.clear()
+
+
+atexit.register(_close_conns)
+
+# Databases whose schema has been created in this process. The write and
+# read paths all call init_shadow_db defensively, so without the guard
+# every insert paid an extra connection plus DDL parsing.
+_DB_READY: set[str] = set()
+
+
+def _migrate_text_timestamps(cursor: sqlite3.Cursor) -> None:
+    """
+    One-time rebuild of a legacy shadow_trades table whose timestamp
+    column was ISO TEXT. Epoch integers compare without the datetime()
+    scalar, so the range filter in the stats query can use the
+    timestamp index instead of scanning.
+    """
+    cursor.execute("PRAGMA table_info(shadow_trades)")
+    columns = {row[1]: (row[2] or "").upper() for row in cursor.fetchall()}
+    if columns.get("timestamp") != "TEXT":
+        return
+
+    logger.info("Migrating shadow_trades timestamps from TEXT to INTEGER epoch")
+    cursor.execute("ALTER TABLE shadow_trades RENAME TO shadow_trades_legacy")
+    cursor.execute('''
+        CREATE TABLE shadow_trades (
+            id INTEGER PRIMARY KEY,
+            timestamp INTEGER NOT NULL,
+            symbol TEXT NOT NULL,
+            buy_exchange TEXT NOT NULL,
+            sell_exchange TEXT NOT NULL,
+            buy_price REAL NOT NULL,
+            sell_price REAL NOT NULL,
+            amount REAL NOT NULL,
+            gross_spread_percent REAL,
+            net_spread_percent REAL,
+            fees_estimated REAL,
+            pnl_usd REAL NOT NULL,
+            slippage_estimated REAL,
+            strategy_params TEXT,
+            extra_info TEXT
+        )
+    ''')
+    cursor.execute('''
+        INSERT INTO shadow_trades (
+            id, timestamp, symbol, buy_exchange, sell_exchange,
+            buy_price, sell_price, amount,
+            gross_spread_percent, net_spread_percent,
+            fees_estimated, pnl_usd, slippage_estimated,
+            strategy_params, extra_info
+        )
+        SELECT
+            id, CAST(strftime('%s', timestamp) AS INTEGER), symbol, buy_exchange, sell_exchange,
+            buy_price, sell_price, amount,
+            gross_spread_percent, net_spread_percent,
+            fees_estimated, pnl_usd, slippage_estimated,
+            strategy_params, extra_info
+        FROM shadow_trades_legacy
+    ''')
+    cursor.execute("DROP TABLE shadow_trades_legacy")
+    cursor.execute("DROP INDEX IF EXISTS idx_shadow_timestamp")
+
 
 def init_shadow_db(db_path: str = SHADOW_DB_PATH) -> None:
-    """Initialize the shadow trading database."""
-    conn = sqlite3.connect(db_path)
+    """Initialize the shadow trading database (no-op after the first call)."""
+    if db_path in _DB_READY:
+        return
+
+    conn = _get_conn(db_path)
     cursor = conn.cursor()
 
+    _migrate_text_timestamps(cursor)
+
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS shadow_trades (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp TEXT NOT NULL,
+            id INTEGER PRIMARY KEY,
+            timestamp INTEGER NOT NULL,
             symbol TEXT NOT NULL,
             buy_exchange TEXT NOT NULL,
             sell_exchange TEXT NOT NULL,
@@ -41,13 +180,31 @@ def init_shadow_db(db_path: str = SHADOW_DB_PATH) -> None:
         )
     ''')
 
+    # The index used to be declared with DESC; an ascending B-tree scans
+    # equally well in both directions, serving the ORDER BY ... DESC read
+    # and the >= range probes without a reversed-page traversal. Rebuild
+    # databases still carrying the old definition.
+    cursor.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'index' AND name = 'idx_shadow_timestamp'"
+    )
+    row = cursor.fetchone()
+    if row is not None and "DESC" in (row[0] or ""):
+        cursor.execute("DROP INDEX idx_shadow_timestamp")
+
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_shadow_timestamp
+        ON shadow_trades(timestamp)
+    ''')
+
+    # Covers every column the stats aggregation touches, so the window
+    # query runs off index pages without visiting the table B-tree.
     cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_shadow_timestamp 
-        ON shadow_trades(timestamp DESC)
+        CREATE INDEX IF NOT EXISTS idx_shadow_ts_pnl
+        ON shadow_trades(timestamp, pnl_usd)
     ''')
 
     conn.commit()
-    conn.close()
+    _DB_READY.add(db_path)
     logger.debug("Shadow database initialized")
 
 
@@ -75,8 +232,8 @@ def simulate_arbitrage(
     if position_size is None:
         position_size = conf.MAX_CAPITAL_PER_TRADE_USD / buy_price
 
-    buy_fee_rate = config.EXCHANGE_FEES.get(buy_exchange, {}).get("taker", 0.001)
-    sell_fee_rate = config.EXCHANGE_FEES.get(sell_exchange, {}).get("taker", 0.001)
+    buy_fee_rate = _TAKER.get(buy_exchange, _DEFAULT_TAKER)
+    sell_fee_rate = _TAKER.get(sell_exchange, _DEFAULT_TAKER)
 
     estimated_cost = position_size * buy_price
     estimated_revenue = position_size * sell_price
@@ -91,7 +248,7 @@ def simulate_arbitrage(
     net_profit = gross_profit - total_fees - estimated_slippage
 
     shadow_trade = {
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": int(time.time()),
         "symbol": symbol,
         "buy_exchange": buy_exchange,
         "sell_exchange": sell_exchange,
@@ -103,38 +260,191 @@ def simulate_arbitrage(
         "fees_estimated": total_fees,
         "pnl_usd": net_profit,
         "slippage_estimated": estimated_slippage,
-        "strategy_params": json.dumps({
+        # Left as dicts; the flush that writes the batch serializes them,
+        # so an opportunity that never reaches the database pays nothing.
+        "strategy_params": {
             "buy_fee_rate": buy_fee_rate,
             "sell_fee_rate": sell_fee_rate,
             "max_slippage": conf.MAX_SLIPPAGE_PERCENT,
             "min_spread": conf.MIN_SPREAD_PERCENT
-        }),
-        "extra_info": json.dumps({
+        },
+        "extra_info": {
             "opportunity": opportunity,
             "position_size_usd": estimated_cost
-        })
+        } if config.SHADOW_STORE_EXTRA_INFO else None
     }
 
     return shadow_trade
 
 
-def insert_shadow_trade(record: dict, db_path: str = SHADOW_DB_PATH) -> None:
-    """Insert a shadow trade record into the database."""
-    init_shadow_db(db_path)
+def simulate_arbitrage_batch(
+    opportunities: list[dict],
+    balances: dict,
+    conf: Any
+) -> list[dict]:
+    """
+    Simulate a whole scan's worth of opportunities in one pass.
 
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
+    Equivalent to calling simulate_arbitrage per opportunity, but the
+    per-trade constants — timestamp, fee table lookups, slippage factor,
+    strategy snapshot — are bound once per batch instead of once per
+    opportunity, which matters when a tick yields hundreds of candidates.
+    """
+    if not opportunities:
+        return []
 
-    cursor.execute('''
-        INSERT INTO shadow_trades (
-            timestamp, symbol, buy_exchange, sell_exchange,
-            buy_price, sell_price, amount,
-            gross_spread_percent, net_spread_percent,
-            fees_estimated, pnl_usd, slippage_estimated,
-            strategy_params, extra_info
-        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    ''', (
-        record.get("timestamp", datetime.utcnow().isoformat()),
+    now = int(time.time())
+    capital = conf.MAX_CAPITAL_PER_TRADE_USD
+    max_slippage = conf.MAX_SLIPPAGE_PERCENT
+    min_spread = conf.MIN_SPREAD_PERCENT
+    slip_factor = max_slippage / 200.0
+    store_extra = config.SHADOW_STORE_EXTRA_INFO
+    taker = _TAKER.get
+
+    results = []
+    for opportunity in opportunities:
+        buy_price = opportunity.get("buy_price", 0)
+        sell_price = opportunity.get("sell_price", 0)
+        if buy_price <= 0 or sell_price <= 0:
+            continue
+
+        buy_exchange = opportunity.get("buy_exchange_id", "")
+        sell_exchange = opportunity.get("sell_exchange_id", "")
+        buy_fee_rate = taker(buy_exchange, _DEFAULT_TAKER)
+        sell_fee_rate = taker(sell_exchange, _DEFAULT_TAKER)
+
+        position_size = capital / buy_price
+        estimated_cost = position_size * buy_price
+        estimated_revenue = position_size * sell_price
+        total_fees = estimated_cost * buy_fee_rate + estimated_revenue * sell_fee_rate
+        estimated_slippage = (estimated_cost + estimated_revenue) * slip_factor
+        net_profit = estimated_revenue - estimated_cost - total_fees - estimated_slippage
+
+        results.append({
+            "timestamp": now,
+            "symbol": opportunity.get("symbol", ""),
+            "buy_exchange": buy_exchange,
+            "sell_exchange": sell_exchange,
+            "buy_price": buy_price,
+            "sell_price": sell_price,
+            "amount": position_size,
+            "gross_spread_percent": opportunity.get("raw_spread_percent", 0),
+            "net_spread_percent": opportunity.get("net_spread_percent", 0),
+            "fees_estimated": total_fees,
+            "pnl_usd": net_profit,
+            "slippage_estimated": estimated_slippage,
+            "strategy_params": {
+                "buy_fee_rate": buy_fee_rate,
+                "sell_fee_rate": sell_fee_rate,
+                "max_slippage": max_slippage,
+                "min_spread": min_spread
+            },
+            "extra_info": {
+                "opportunity": opportunity,
+                "position_size_usd": estimated_cost
+            } if store_extra else None
+        })
+
+    return results
+
+
+# Rows waiting to be written, per database. A scan can simulate many
+# opportunities back to back; buffering them and committing in one
+# transaction turns one fsync per trade into one per batch.
+_FLUSH_BATCH_SIZE = 500
+_FLUSH_INTERVAL_SECONDS = 1.0
+_pending: dict[str, list[tuple]] = {}
+_pending_lock = threading.Lock()
+_last_flush: dict[str, float] = {}
+
+_INSERT_SQL = '''
+    INSERT INTO shadow_trades (
+        timestamp, symbol, buy_exchange, sell_exchange,
+        buy_price, sell_price, amount,
+        gross_spread_percent, net_spread_percent,
+        fees_estimated, pnl_usd, slippage_estimated,
+        strategy_params, extra_info
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SELECT_RECENT_SQL = '''
+    SELECT * FROM shadow_trades
+    ORDER BY timestamp DESC
+    LIMIT ?
+'''
+
+_STATS_SQL = '''
+    SELECT
+        COUNT(*) as total_trades,
+        COALESCE(SUM(pnl_usd), 0) as total_pnl_usd,
+        COALESCE(AVG(pnl_usd), 0) as avg_pnl_per_trade,
+        COALESCE(MAX(pnl_usd), 0) as best_trade_pnl,
+        COALESCE(MIN(pnl_usd), 0) as worst_trade_pnl,
+        SUM(CASE WHEN pnl_usd > 0 THEN 1 ELSE 0 END) as winning_trades
+    FROM shadow_trades
+    WHERE timestamp >= ?
+'''
+
+
+# Recent get_shadow_stats results keyed by (db_path, days). Dashboard
+# widgets poll the same windows repeatedly; between flushes the answer
+# cannot change from this process, and the short TTL bounds staleness
+# against writers in other processes.
+_STATS_CACHE_TTL_SECONDS = 2.0
+_stats_cache: dict[tuple[str, int], tuple[float, dict]] = {}
+
+
+def flush_shadow_trades(db_path: str = SHADOW_DB_PATH) -> None:
+    """Write any buffered shadow trades in a single transaction."""
+    with _pending_lock:
+        rows = _pending.get(db_path)
+        if not rows:
+            return
+        _pending[db_path] = []
+        _last_flush[db_path] = time.monotonic()
+
+    try:
+        init_shadow_db(db_path)
+        conn = _get_conn(db_path)
+        cursor = conn.cursor()
+        rows = [
+            (*row[:12],
+             row[12] if isinstance(row[12], (str, type(None))) else _dumps(row[12]),
+             row[13] if isinstance(row[13], (str, type(None))) else _dumps(row[13]))
+            for row in rows
+        ]
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.executemany(_INSERT_SQL, rows)
+        conn.commit()
+        for key in [k for k in _stats_cache if k[0] == db_path]:
+            del _stats_cache[key]
+        logger.debug(f"Flushed {len(rows)} shadow trades")
+    except Exception as e:
+        logger.error(f"Error flushing shadow trades: {e}")
+        try:
+            _get_conn(db_path).rollback()
+        except Exception:
+            pass
+
+
+def _flush_all_pending() -> None:
+    """Flush every buffered database at interpreter exit."""
+    for db_path in list(_pending):
+        flush_shadow_trades(db_path)
+
+
+atexit.register(_flush_all_pending)
+
+
+def insert_shadow_trade(record: dict, db_path: str = SHADOW_DB_PATH) -> None:
+    """
+    Queue a shadow trade record for insertion.
+    Rows are buffered and written in batches, either when the buffer
+    fills or after a second; readers in this process flush first, so
+    the batching is invisible to them.
+    """
+    row = (
+        record.get("timestamp", int(time.time())),
         record.get("symbol", ""),
         record.get("buy_exchange", ""),
         record.get("sell_exchange", ""),
@@ -148,31 +458,34 @@ def insert_shadow_trade(record: dict, db_path: str = SHADOW_DB_PATH) -> None:
         record.get("slippage_estimated"),
         record.get("strategy_params"),
         record.get("extra_info")
-    ))
+    )
+
+    with _pending_lock:
+        rows = _pending.setdefault(db_path, [])
+        rows.append(row)
+        now = time.monotonic()
+        due = (
+            len(rows) >= _FLUSH_BATCH_SIZE
+            or now - _last_flush.get(db_path, 0.0) >= _FLUSH_INTERVAL_SECONDS
+        )
 
-    conn.commit()
-    conn.close()
-    logger.debug(f"Shadow trade saved: {record.get('symbol')} PnL: ${record.get('pnl_usd', 0):.2f}")
+    if due:
+        flush_shadow_trades(db_path)
+    logger.debug(f"Shadow trade queued: {record.get('symbol')} PnL: ${record.get('pnl_usd', 0):.2f}")
 
 
 def get_shadow_trades(limit: int = 100, db_path: str = SHADOW_DB_PATH) -> list:
     """Get recent shadow trades."""
     try:
+        flush_shadow_trades(db_path)
         init_shadow_db(db_path)
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
+        conn = _get_conn(db_path)
         cursor = conn.cursor()
 
-        cursor.execute('''
-            SELECT * FROM shadow_trades
-            ORDER BY timestamp DESC
-            LIMIT ?
-        ''', (limit,))
+        cursor.execute(_SELECT_RECENT_SQL, (limit,))
 
         rows = cursor.fetchall()
-        trades = [dict(row) for row in rows]
-        conn.close()
-        return trades
+        return [dict(row) for row in rows]
     except Exception as e:
         logger.error(f"Error getting shadow trades: {e}")
         return []
@@ -181,30 +494,25 @@ def get_shadow_trades(limit: int = 100, db_path: str = SHADOW_DB_PATH) -> list:
 def get_shadow_stats(days: int = 7, db_path: str = SHADOW_DB_PATH) -> dict:
     """Get shadow trading statistics."""
     try:
+        flush_shadow_trades(db_path)
+        cache_key = (db_path, days)
+        cached = _stats_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < _STATS_CACHE_TTL_SECONDS:
+            return cached[1]
+
         init_shadow_db(db_path)
-        conn = sqlite3.connect(db_path)
+        conn = _get_conn(db_path)
         cursor = conn.cursor()
 
-        cursor.execute('''
-            SELECT 
-                COUNT(*) as total_trades,
-                COALESCE(SUM(pnl_usd), 0) as total_pnl_usd,
-                COALESCE(AVG(pnl_usd), 0) as avg_pnl_per_trade,
-                COALESCE(MAX(pnl_usd), 0) as best_trade_pnl,
-                COALESCE(MIN(pnl_usd), 0) as worst_trade_pnl,
-                SUM(CASE WHEN pnl_usd > 0 THEN 1 ELSE 0 END) as winning_trades
-            FROM shadow_trades
-            WHERE timestamp >= datetime('now', ?)
-        ''', (f'-{days} days',))
+        cursor.execute(_STATS_SQL, (int(time.time()) - days * 86400,))
 
         row = cursor.fetchone()
-        conn.close()
 
         total_trades = row[0] or 0
         winning_trades = row[5] or 0
         win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0.0
 
-        return {
+        stats = {
             "total_trades": total_trades,
             "total_pnl_usd": round(row[1] or 0, 2),
             "avg_pnl_per_trade": round(row[2] or 0, 2),
@@ -212,6 +520,8 @@ def get_shadow_stats(days: int = 7, db_path: str = SHADOW_DB_PATH) -> dict:
             "worst_trade_pnl": round(row[4] or 0, 2),
             "win_rate": round(win_rate, 1)
         }
+        _stats_cache[cache_key] = (time.monotonic(), stats)
+        return stats
     except Exception as e:
         logger.error(f"Error getting shadow stats: {e}")
         return {}
@@ -17,9 +17,10 @@ function formatCurrency(value) {
     return prefix + Math.abs(num).toFixed(2);
 }
 
-function formatDate(isoString) {
-    if (!isoString) return '--';
-    const date = new Date(isoString);
+function formatDate(value) {
+    if (!value) return '--';
+    // Shadow trades store unix seconds; other rows still use ISO strings.
+    const date = typeof value === 'number' ? new Date(value * 1000) : new Date(value);
     return date.toLocaleString();
 }
 
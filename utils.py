@@ -22,32 +22,86 @@ ALERT_EMAIL=recipient@example.com
 ----------------------------
 """
 
+import atexit
+import functools
 import os
+import queue
 import smtplib
+import threading
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
+from types import SimpleNamespace
 from typing import Optional
 from dotenv import load_dotenv
 
 from logger import get_logger
+import config
+
+try:
+    import requests
+except ImportError:
+    requests = None
 
 logger = get_logger(__name__)
 
+# A shared session reuses the TCP/TLS connection to the Telegram API
+# instead of paying the handshake on every alert.
+_SESSION = requests.Session() if requests is not None else None
+
+# sendMessage URL, built once from the bot token on first use.
+_TG_URL: Optional[str] = None
+
+# Credentials never change while the bot runs, so they are read from the
+# environment once instead of on every alert.
+_CREDS: Optional[SimpleNamespace] = None
+
+
+def _load_creds() -> SimpleNamespace:
+    """Read alerting credentials from the environment and cache them."""
+    global _CREDS
+    creds = SimpleNamespace(
+        tg_token=os.getenv("TELEGRAM_BOT_TOKEN"),
+        tg_chat=os.getenv("TELEGRAM_CHAT_ID"),
+        smtp_host=os.getenv("SMTP_HOST"),
+        smtp_port=int(os.getenv("SMTP_PORT", "587")),
+        smtp_user=os.getenv("SMTP_USER"),
+        smtp_password=os.getenv("SMTP_PASSWORD"),
+        alert_email=os.getenv("ALERT_EMAIL"),
+    )
+    _CREDS = creds
+    return creds
+
+
+# The bot only ever trades the configured pairs, so their base/quote split
+# can be computed once instead of re-parsing the symbol on every trade.
+_SYMBOL_META: dict[str, tuple[str, str]] = {
+    symbol: tuple(symbol.split("/", 1))
+    for symbol in config.TRADING_PAIRS
+    if symbol.count("/") == 1
+}
+
 
 def load_env() -> None:
     """Load environment variables from .env file."""
     load_dotenv()
+    _load_creds()
+
+
+# Compiled once; format_map pulls the fields straight out of the
+# opportunity dict without the per-field indexing an f-string would do.
+_OPP_FMT = (
+    "[{symbol}] "
+    "BUY on {buy_exchange_id} @ {buy_price:.2f} | "
+    "SELL on {sell_exchange_id} @ {sell_price:.2f} | "
+    "Raw spread: {raw_spread_percent:.3f}% | "
+    "Net spread: {net_spread_percent:.3f}%"
+)
 
 
 def format_opportunity(opportunity: dict) -> str:
     """Format an arbitrage opportunity for logging."""
-    return (
-        f"[{opportunity['symbol']}] "
-        f"BUY on {opportunity['buy_exchange_id']} @ {opportunity['buy_price']:.2f} | "
-        f"SELL on {opportunity['sell_exchange_id']} @ {opportunity['sell_price']:.2f} | "
-        f"Raw spread: {opportunity['raw_spread_percent']:.3f}% | "
-        f"Net spread: {opportunity['net_spread_percent']:.3f}%"
-    )
+    return _OPP_FMT.format_map(opportunity)
 
 
 def usd_to_coin_amount(usd_amount: float, coin_price: float) -> float:
@@ -57,12 +111,16 @@ def usd_to_coin_amount(usd_amount: float, coin_price: float) -> float:
     return usd_amount / coin_price
 
 
+@functools.lru_cache(maxsize=1024)
 def extract_base_quote(symbol: str) -> tuple[str, str]:
     """Extract base and quote currencies from a trading pair symbol."""
-    parts = symbol.split("/")
-    if len(parts) != 2:
-        return "", ""
-    return parts[0], parts[1]
+    # Symbols outside the configured pairs (exchange-discovered markets)
+    # get memoized too, so each one is parsed at most once.
+    meta = _SYMBOL_META.get(symbol)
+    if meta is not None:
+        return meta
+    base, sep, quote = symbol.rpartition("/")
+    return (base, quote) if sep else ("", "")
 
 
 def send_telegram(message: str) -> bool:
@@ -70,85 +128,155 @@ def send_telegram(message: str) -> bool:
     Send a message via Telegram bot.
     Requires TELEGRAM_BOT_TOKEN and TELEGRAM_CHAT_ID in environment.
     """
-    try:
-        import requests
-    except ImportError:
+    global _TG_URL
+
+    if requests is None:
         logger.warning("requests library not installed, cannot send Telegram message")
         return False
 
-    token = os.getenv("TELEGRAM_BOT_TOKEN")
-    chat_id = os.getenv("TELEGRAM_CHAT_ID")
+    creds = _CREDS if _CREDS is not None else _load_creds()
 
-    if not token or not chat_id:
+    if not creds.tg_token or not creds.tg_chat:
         logger.debug("Telegram credentials not configured")
         return False
 
+    if _TG_URL is None:
+        _TG_URL = f"https://api.telegram.org/bot{creds.tg_token}/sendMessage"
+
     try:
-        url = f"https://api.telegram.org/bot{token}/sendMessage"
         payload = {
-            "chat_id": chat_id,
+            "chat_id": creds.tg_chat,
             "text": message,
             "parse_mode": "HTML"
         }
-        response = requests.post(url, json=payload, timeout=10)
-        if response.status_code == 200:
+        # The body is read (it's a few hundred bytes) but never parsed;
+        # draining it lets the session return the connection to its
+        # keep-alive pool instead of closing it.
+        response = _SESSION.post(_TG_URL, json=payload, timeout=10)
+        ok = response.ok
+        status = response.status_code
+        response.close()
+        if ok:
             logger.debug("Telegram message sent successfully")
             return True
         else:
-            logger.warning(f"Telegram API error: {response.status_code}")
+            logger.warning(f"Telegram API error: {status}")
             return False
     except Exception as e:
         logger.error(f"Failed to send Telegram message: {e}")
         return False
 
 
+# Persistent SMTP connection. The starttls/login handshake is several
+# round trips per call, so the session is kept open and re-checked with
+# a NOOP before each send, reconnecting if the server has dropped it.
+_SMTP: Optional[smtplib.SMTP] = None
+_SMTP_LOCK = threading.Lock()
+
+
+def _smtp_connect(host: str, port: int, user: str, password: str) -> smtplib.SMTP:
+    """Open, authenticate and return a new SMTP session."""
+    server = smtplib.SMTP(host, port)
+    server.starttls()
+    server.login(user, password)
+    return server
+
+
 def send_email(message: str, subject: str = "Arbitrage Bot Alert") -> bool:
     """
     Send an email alert.
     Requires SMTP_HOST, SMTP_PORT, SMTP_USER, SMTP_PASSWORD, ALERT_EMAIL in environment.
     """
-    smtp_host = os.getenv("SMTP_HOST")
-    smtp_port = os.getenv("SMTP_PORT", "587")
-    smtp_user = os.getenv("SMTP_USER")
-    smtp_password = os.getenv("SMTP_PASSWORD")
-    alert_email = os.getenv("ALERT_EMAIL")
+    global _SMTP
 
-    if not all([smtp_host, smtp_user, smtp_password, alert_email]):
+    creds = _CREDS if _CREDS is not None else _load_creds()
+
+    if not (creds.smtp_host and creds.smtp_user and creds.smtp_password and creds.alert_email):
         logger.debug("Email credentials not configured")
         return False
 
     try:
         msg = MIMEMultipart()
-        msg["From"] = str(smtp_user)
-        msg["To"] = str(alert_email)
+        msg["From"] = creds.smtp_user
+        msg["To"] = creds.alert_email
         msg["Subject"] = subject
         msg.attach(MIMEText(message, "plain"))
 
-        server = smtplib.SMTP(str(smtp_host), int(smtp_port))
-        server.starttls()
-        server.login(str(smtp_user), str(smtp_password))
-        server.send_message(msg)
-        server.quit()
+        with _SMTP_LOCK:
+            if _SMTP is not None:
+                try:
+                    _SMTP.noop()
+                except (smtplib.SMTPServerDisconnected, OSError):
+                    _SMTP = None
+            if _SMTP is None:
+                _SMTP = _smtp_connect(
+                    creds.smtp_host, creds.smtp_port, creds.smtp_user, creds.smtp_password
+                )
+            _SMTP.send_message(msg)
 
         logger.debug("Email alert sent successfully")
         return True
     except Exception as e:
+        with _SMTP_LOCK:
+            _SMTP = None
         logger.error(f"Failed to send email: {e}")
         return False
 
 
-def send_alert(message: str, subject: str = "Arbitrage Bot Alert") -> None:
-    """Send alert via all configured channels (Telegram, Email)."""
+# Alerts are delivered off the trading thread: send_alert enqueues and a
+# daemon worker does the slow network calls. Bounded so a dead Telegram
+# endpoint cannot grow the queue without limit; overflow drops the alert.
+_ALERT_Q: queue.Queue = queue.Queue(maxsize=1024)
+
+
+def _alert_worker() -> None:
+    """Drain the alert queue, delivering each alert to every channel."""
+    while True:
+        message, subject = _ALERT_Q.get()
+        try:
+            send_telegram(f"🤖 <b>{subject}</b>\n\n{message}")
+            send_email(message, subject)
+        except Exception as e:
+            logger.error(f"Alert delivery failed: {e}")
+        finally:
+            _ALERT_Q.task_done()
+
+
+_alert_thread = threading.Thread(target=_alert_worker, name="alerts", daemon=True)
+_alert_thread.start()
+
+
+def _drain_alerts(timeout: float = 10.0) -> None:
+    """Give the worker a bounded window to deliver queued alerts at exit."""
+    deadline = time.monotonic() + timeout
+    while _ALERT_Q.unfinished_tasks and time.monotonic() < deadline:
+        time.sleep(0.1)
+
+
+atexit.register(_drain_alerts)
+
+
+def send_alert(message: str, subject: str = "Arbitrage Bot Alert", wait: bool = False) -> None:
+    """
+    Send an alert via all configured channels (Telegram, Email).
+    Delivery normally happens on the background worker; pass wait=True on
+    shutdown paths where the process exits right after the call.
+    """
     logger.info(f"ALERT: {message}")
-    send_telegram(f"🤖 <b>{subject}</b>\n\n{message}")
-    send_email(message, subject)
+    if wait:
+        send_telegram(f"🤖 <b>{subject}</b>\n\n{message}")
+        send_email(message, subject)
+        return
+    try:
+        _ALERT_Q.put_nowait((message, subject))
+    except queue.Full:
+        logger.warning("Alert queue full, dropping alert")
 
 
 def format_usd(value: float) -> str:
     """Format a value as USD currency."""
-    if value >= 0:
-        return f"${value:.2f}"
-    return f"-${abs(value):.2f}"
+    sign = "-" if value < 0 else ""
+    return f"{sign}${abs(value):.2f}"
 
 
 def format_percent(value: float) -> str: